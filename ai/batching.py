@@ -0,0 +1,43 @@
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English text).
+    Only used for budgeting, so it errs on the high side.
+    """
+    return len(text) // 4 + 1
+
+
+def plan_batches(
+    sizes: list[int],
+    *,
+    overhead: int,
+    max_input_tokens: int,
+    max_output_tokens: int,
+    output_per_item: int,
+) -> list[list[int]]:
+    """
+    Pack items into batches, keeping their order.
+
+    sizes:            estimated input tokens of each item's block
+    overhead:         tokens the prompt costs with no items in it
+    max_input_tokens: input budget per prompt (overhead included)
+    max_output_tokens / output_per_item: caps the item count per prompt
+
+    Returns lists of item indices. An item larger than the budget on its
+    own still gets a batch of its own rather than being dropped.
+    """
+    per_batch = max(1, max_output_tokens // max(1, output_per_item))
+
+    batches: list[list[int]] = []
+    current: list[int] = []
+    used = overhead
+
+    for i, size in enumerate(sizes):
+        if current and (used + size > max_input_tokens or len(current) >= per_batch):
+            batches.append(current)
+            current, used = [], overhead
+        current.append(i)
+        used += size
+
+    if current:
+        batches.append(current)
+    return batches
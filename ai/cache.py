@@ -1,40 +1,501 @@
 import hashlib
 import json
+import logging
+import sqlite3
+import threading
 import time
-from flowc.config import Config 
+from collections import OrderedDict
+from flowc.config import Config
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 CACHE_DIR = Config.FLOWC_ROOT / ".." / ".flowc_cache"
 CACHE_DIR.mkdir(exist_ok=True)
 
+_PRUNE_EVERY = 200  # writes between full prune() passes (age + recount)
+_LOW_WATER = 0.9  # write-triggered prunes evict down to 90% of the cap
+
 
 def _key(model: str, prompt: str) -> str:
     raw = f"{model}\n{prompt}"
     return hashlib.sha256(raw.encode()).hexdigest()
 
 
-def cache_get(model: str, prompt: str, ttl: int | None):
-    key = _key(model, prompt)
-    f = CACHE_DIR / f"{key}.json"
-    if not f.exists():
-        return None
+# -------------------------------------------------------------------------
+# Backends
+#
+# A backend stores (created_at, out) per key. TTL checks live in
+# cache_get() so every backend expires entries the same way.
+# -------------------------------------------------------------------------
+class JsonFileCache:
+    """
+    Legacy layout: one JSON file per prompt hash in CACHE_DIR.
+    """
 
-    try:
-        data = json.loads(f.read_text())
-    except Exception:
-        return None
+    name = "json"
 
-    if ttl is None:
-        return data["out"]
+    def __init__(self, directory: Path = CACHE_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> tuple[float, str] | None:
+        f = self.directory / f"{key}.json"
+        if not f.exists():
+            return None
+
+        try:
+            data = json.loads(f.read_text())
+        except Exception:
+            return None
+
+        return data["time"], data["out"]
+
+    def set(self, key: str, model: str, out: str, created_at: float | None = None):
+        f = self.directory / f"{key}.json"
+        data = {"time": created_at or time.time(), "out": out}
+        f.write_text(json.dumps(data, ensure_ascii=False))
+
+    def stats(self) -> dict:
+        files = list(self.directory.glob("*.json"))
+        return {
+            "backend": self.name,
+            "path": str(self.directory),
+            "entries": len(files),
+            "bytes": sum(f.stat().st_size for f in files),
+        }
+
+    def prune(self, max_age: int | None = None) -> int:
+        if not max_age:
+            return 0
+        cutoff = time.time() - max_age
+        removed = 0
+        for f in self.directory.glob("*.json"):
+            if f.stat().st_mtime < cutoff:
+                f.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class SQLiteCache:
+    """
+    Single-file SQLite (WAL) cache with a byte/entry cap.
+
+    policy="lru" evicts the least recently hit entries first; policy="ttl"
+    drops entries older than max_age and then the oldest ones first.
+
+    Writes keep a running entry/byte count instead of rescanning the
+    table; prune() runs when that count crosses a cap, and every
+    _PRUNE_EVERY writes to expire old entries and pick up writes from
+    other processes.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = 0,
+        max_entries: int = 0,
+        policy: str = "lru",
+        max_age: int | None = None,
+    ):
+        if policy not in ("lru", "ttl"):
+            raise ValueError(f"unknown cache eviction policy: {policy!r}")
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.policy = policy
+        self.max_age = max_age
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_table()
+        self._writes = 0
+        with self._lock:
+            self._entries, self._bytes = self._totals(self.conn.cursor())
+
+    def _init_table(self):
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ai_cache (
+                    key TEXT PRIMARY KEY,       -- _key(model, prompt)
+                    model TEXT,                 -- NULL for entries imported from JSON
+                    out TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_hit_at REAL NOT NULL,
+                    size INTEGER NOT NULL       -- bytes of `out` (utf-8)
+                )
+                """
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ai_cache_last_hit ON ai_cache(last_hit_at)"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ai_cache_created ON ai_cache(created_at)"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ai_cache_model ON ai_cache(model)"
+            )
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ai_cache_meta (
+                    name TEXT PRIMARY KEY,
+                    value TEXT
+                )
+                """
+            )
+            self.conn.commit()
+
+    def get(self, key: str) -> tuple[float, str] | None:
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("SELECT created_at, out FROM ai_cache WHERE key = ?", (key,))
+            row = cur.fetchone()
+            if row is None:
+                return None
+            cur.execute(
+                "UPDATE ai_cache SET last_hit_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self.conn.commit()
+        return row[0], row[1]
+
+    def set(self, key: str, model: str, out: str, created_at: float | None = None):
+        now = time.time()
+        size = len(out.encode("utf-8"))
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("SELECT size FROM ai_cache WHERE key = ?", (key,))
+            old = cur.fetchone()
+            cur.execute(
+                """
+                INSERT OR REPLACE INTO ai_cache
+                (key, model, out, created_at, last_hit_at, size)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, out, created_at or now, now, size),
+            )
+            self.conn.commit()
+            if old is None:
+                self._entries += 1
+            self._bytes += size - (old[0] if old else 0)
+            self._writes += 1
+            due = self._over_cap() or self._writes % _PRUNE_EVERY == 0
+        if due:
+            self.prune(low_water=_LOW_WATER)
+
+    def _over_cap(self) -> bool:
+        return bool(
+            (self.max_entries and self._entries > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        )
+
+    @staticmethod
+    def _totals(cur) -> tuple[int, int]:
+        cur.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ai_cache")
+        entries, total = cur.fetchone()
+        return entries, total
+
+    # ----------------------------------------------------------
+    # eviction
+    # ----------------------------------------------------------
+    def prune(self, max_age: int | None = None, low_water: float = 1.0) -> int:
+        """
+        Enforce age and size limits. Return the number of evicted entries.
+        Once over a cap, evict down to `low_water` times the cap so the
+        next writes do not each trigger another pass.
+        """
+        if max_age is None and self.policy == "ttl":
+            max_age = self.max_age
+        order = "last_hit_at" if self.policy == "lru" else "created_at"
+        max_entries = int(self.max_entries * low_water)
+        max_bytes = int(self.max_bytes * low_water)
+
+        removed = 0
+        with self._lock:
+            cur = self.conn.cursor()
+
+            if max_age:
+                cur.execute(
+                    "DELETE FROM ai_cache WHERE created_at < ?",
+                    (time.time() - max_age,),
+                )
+                removed += cur.rowcount
+
+            entries, total = self._totals(cur)
+
+            over = (self.max_entries and entries > self.max_entries) or (
+                self.max_bytes and total > self.max_bytes
+            )
+            if over:
+                excess = entries - max_entries if self.max_entries else 0
+                victims = []
+                rows = self.conn.execute(f"SELECT key, size FROM ai_cache ORDER BY {order}")
+                for key, size in rows:
+                    if excess <= 0 and (not self.max_bytes or total <= max_bytes):
+                        break
+                    victims.append((key,))
+                    excess -= 1
+                    total -= size
+                cur.executemany("DELETE FROM ai_cache WHERE key = ?", victims)
+                removed += len(victims)
+                entries -= len(victims)
+
+            self.conn.commit()
+            self._entries, self._bytes = entries, total
+
+        if removed:
+            logger.info("AI cache: evicted %d entr(ies) (policy=%s)", removed, self.policy)
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(size), 0),
+                       MIN(created_at), MAX(last_hit_at)
+                FROM ai_cache
+                """
+            )
+            entries, total, oldest, last_hit = cur.fetchone()
+            cur.execute(
+                """
+                SELECT COALESCE(model, '(imported)'), COUNT(*), SUM(size)
+                FROM ai_cache GROUP BY model ORDER BY COUNT(*) DESC
+                """
+            )
+            models = {m: {"entries": c, "bytes": b} for m, c, b in cur.fetchall()}
+
+        return {
+            "backend": self.name,
+            "path": str(self.path),
+            "policy": self.policy,
+            "entries": entries,
+            "bytes": total,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "oldest_created_at": oldest,
+            "last_hit_at": last_hit,
+            "models": models,
+        }
+
+    # ----------------------------------------------------------
+    # one-shot migration from the JSON file layout
+    # ----------------------------------------------------------
+    def import_json(self, directory: Path = CACHE_DIR, *, remove: bool = True) -> int:
+        """
+        Copy every <key>.json entry into the store. Imported files are
+        deleted when `remove` is set. Return the number of imported entries.
+        """
+        files = list(Path(directory).glob("*.json"))
+        rows = []
+        for f in files:
+            try:
+                data = json.loads(f.read_text())
+                out = data["out"]
+                created = float(data["time"])
+            except Exception:
+                logger.warning("AI cache: skipping unreadable cache file %s", f.name)
+                continue
+            rows.append((f.stem, out, created, created, len(out.encode("utf-8"))))
+
+        with self._lock:
+            self.conn.executemany(
+                """
+                INSERT OR IGNORE INTO ai_cache
+                (key, model, out, created_at, last_hit_at, size)
+                VALUES (?, NULL, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO ai_cache_meta (name, value) VALUES ('json_migrated', ?)",
+                (str(time.time()),),
+            )
+            self.conn.commit()
+
+        if remove:
+            for f in files:
+                f.unlink(missing_ok=True)
+
+        logger.info("AI cache: imported %d JSON entr(ies) from %s", len(rows), directory)
+        self.prune()
+        return len(rows)
 
+    def json_migrated(self) -> bool:
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("SELECT 1 FROM ai_cache_meta WHERE name = 'json_migrated'")
+            return cur.fetchone() is not None
+
+
+class MemoryCache:
+    """
+    Bounded in-process LRU tier kept in front of the persistent backend.
+
+    Entries keep the created_at of the persistent copy, so a TTL expires
+    at the same moment in both tiers.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, str, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[float, str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        return entry[0], entry[1]
+
+    def set(self, key: str, model: str, out: str, created_at: float | None = None):
+        if self.max_entries <= 0:
+            return
+        size = len(out.encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (created_at or time.time(), out, size)
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# -------------------------------------------------------------------------
+# Module-level tiers
+# -------------------------------------------------------------------------
+_backend = None
+_backend_lock = threading.Lock()
+
+_memory = MemoryCache(
+    max_entries=Config.AI_MEMORY_CACHE_ENTRIES,
+    max_bytes=Config.AI_MEMORY_CACHE_BYTES,
+)
+
+_counters = {
+    "memory": {"hits": 0, "misses": 0},
+    "disk": {"hits": 0, "misses": 0},
+}
+_counters_lock = threading.Lock()
+
+
+def _make_backend():
+    if Config.AI_CACHE_BACKEND == "json":
+        return JsonFileCache(CACHE_DIR)
+
+    if Config.AI_CACHE_BACKEND != "sqlite":
+        raise ValueError(f"unknown AI cache backend: {Config.AI_CACHE_BACKEND!r}")
+
+    backend = SQLiteCache(
+        Config.AI_CACHE_PATH,
+        max_bytes=Config.AI_CACHE_MAX_BYTES,
+        max_entries=Config.AI_CACHE_MAX_ENTRIES,
+        policy=Config.AI_CACHE_POLICY,
+        max_age=Config.AI_CACHE_MAX_AGE,
+    )
+    if not backend.json_migrated():
+        backend.import_json(CACHE_DIR)
+    return backend
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _make_backend()
+    return _backend
+
+
+def _fresh(entry: tuple[float, str] | None, ttl: int | None) -> bool:
+    if entry is None:
+        return False
+    if ttl is None:
+        return True
     # ttl
-    if time.time() - data["time"] < ttl:
-        return data["out"]
+    return time.time() - entry[0] < ttl
+
+
+def _count(tier: str, hit: bool):
+    with _counters_lock:
+        _counters[tier]["hits" if hit else "misses"] += 1
+
 
-    return None
+def cache_lookup(model: str, prompt: str, ttl: int | None) -> tuple[str | None, str | None]:
+    """Return (out, tier) where tier is "memory"/"disk", or (None, None) on a miss."""
+    key = _key(model, prompt)
+
+    entry = _memory.get(key)
+    if _fresh(entry, ttl):
+        _count("memory", True)
+        return entry[1], "memory"
+    _count("memory", False)
+
+    # another process may have written a newer copy, so always ask disk
+    entry = get_backend().get(key)
+    if not _fresh(entry, ttl):
+        _count("disk", False)
+        return None, None
+    _count("disk", True)
+
+    created_at, out = entry
+    _memory.set(key, model, out, created_at=created_at)
+    return out, "disk"
+
+
+def cache_get(model: str, prompt: str, ttl: int | None):
+    return cache_lookup(model, prompt, ttl)[0]
 
 
 def cache_set(model: str, prompt: str, out: str):
     key = _key(model, prompt)
-    f = CACHE_DIR / f"{key}.json"
-    f.write_text(json.dumps({"time": time.time(), "out": out}, ensure_ascii=False))
+    created_at = time.time()
+    _memory.set(key, model, out, created_at=created_at)
+    get_backend().set(key, model, out, created_at=created_at)
+
+
+def cache_stats() -> dict:
+    """Per-tier hit/miss counters for this process, plus memory tier usage."""
+    with _counters_lock:
+        counters = {tier: dict(c) for tier, c in _counters.items()}
+    counters["memory"].update(_memory.stats())
+    return counters
@@ -1,12 +1,16 @@
 import logging
 import hashlib
 
+from flowc.config import Config
 from flowc.connectors.inspire_api import InspireAPI
 from flowc.connectors.hot_paper_pool import HotPaperPool
-from flowc.ai.openai_client import AI
+from flowc.ai.summary import rewrite_abstracts_many
 
 logger = logging.getLogger(__name__)
 
+# only what _extract_papers_from_page reads; skips references, author lists etc.
+INSPIRE_FIELDS = "titles,abstracts,earliest_date,arxiv_eprints,citation_count,collaborations"
+
 
 class InspireHotPaperBootstrap:
     """
@@ -65,34 +69,48 @@ class InspireHotPaperBootstrap:
             if arxivs:
                 arxiv_id = arxivs[0].get("value", None)
 
-            if raw_summary:
-                prompt = f"""
-    Rewrite the following physics paper abstract into a short, clean summary
-    for a daily digest. Keep it factual, concise, and accurate.
-
-    Abstract:
-    {raw_summary}
-
-    Return only the rewritten summary.
-    """
-                clean_summary = AI.model("gpt-4o").ask(prompt, ttl=86400)
-                if not clean_summary:
-                    clean_summary = raw_summary
-            else:
-                clean_summary = ""
+            # weighting inputs for HotPaperPool.rebuild_selection
+            collabs = md.get("collaborations") or []
+            collaboration = collabs[0].get("value") if collabs else None
 
             out.append(
                 {
+                    "id": self._make_id(title, arxiv_id, year),
                     "title": title,
-                    "summary": clean_summary,   
+                    "summary": raw_summary,  # rewritten in bulk by fetch_and_fill
                     "year": year,
                     "arxiv": arxiv_id,
+                    "citations": md.get("citation_count"),
+                    "collaboration": collaboration,
                 }
             )
 
         return out
 
 
+    # ----------------------------------------------------------
+    # drop papers already pooled (bulk lookup, before any AI call)
+    # ----------------------------------------------------------
+    def _only_new(self, page_papers: list[tuple[int, list[dict]]]) -> list[tuple[int, list[dict]]]:
+        everything = [p for _, papers in page_papers for p in papers]
+        known_ids, known_pairs = self.pool.find_existing(
+            [p["id"] for p in everything],
+            [(p["title"], p["year"]) for p in everything],
+        )
+
+        out = []
+        for page, papers in page_papers:
+            new = []
+            for p in papers:
+                pair = (p["title"], p["year"])
+                if p["id"] in known_ids or pair in known_pairs:
+                    continue
+                known_ids.add(p["id"])  # also de-duplicates across pages
+                known_pairs.add(pair)
+                new.append(p)
+            out.append((page, new))
+        return out
+
     # ----------------------------------------------------------
     # fetch and insert
     # ----------------------------------------------------------
@@ -101,48 +119,76 @@ class InspireHotPaperBootstrap:
 
         logger.info("INSPIRE query: %s", query)
 
-        for page in range(1, pages + 1):
-            if self.pool.remaining_count() >= target_size:
+        done = self.pool.done_pages(query)
+        todo = [page for page in range(1, pages + 1) if page not in done]
+        if done:
+            logger.info("Resuming: %d/%d page(s) already done for this query", pages - len(todo), pages)
+
+        # pages are fetched a window at a time (polite concurrency limit);
+        # cached pages come straight from disk
+        window = max(1, Config.INSPIRE_MAX_CONCURRENCY)
+        for first in range(0, len(todo), window):
+            needed = target_size - self.pool.remaining_count()
+            if needed <= 0:
                 logger.info("Target size reached. stopping.")
                 return
 
-            logger.info("Fetching page %d/%d", page, pages)
-
-            data = self.api.fetch(
+            batch = todo[first:first + window]
+            logger.info("Fetching page(s) %s of %d", ", ".join(map(str, batch)), pages)
+            results = self.api.fetch_pages(
                 query=query,
+                pages=batch,
                 size=size,
-                page=page,
                 sort=sort,
+                fields=INSPIRE_FIELDS,
             )
-            if not data:
-                logger.warning("No data for page %d", page)
-                continue
 
-            papers = self._extract_papers_from_page(data)
-            logger.info("Extracted %d papers", len(papers))
+            fetched = []
+            for page, data in zip(batch, results):
+                if not data:
+                    logger.warning("No data for page %d", page)  # left unchecked: retried next run
+                    continue
+                fetched.append((page, self._extract_papers_from_page(data)))
+
+            # only rewrite what is new, and no more than the pool still needs
+            selected: list[dict] = []
+            complete: list[tuple[int, int]] = []
+            for page, new in self._only_new(fetched):
+                take = new[:max(0, needed - len(selected))]
+                selected.extend(take)
+                if len(take) == len(new):
+                    complete.append((page, len(take)))
+            logger.info("%d new paper(s) to add from %d page(s)", len(selected), len(fetched))
+
+            summaries = rewrite_abstracts_many([p["summary"] for p in selected])
+            inserted, skipped = self.pool.add_papers(
+                [{**p, "summary": summary} for p, summary in zip(selected, summaries)]
+            )
+            if skipped:
+                logger.info("Skipped %d paper(s) already in the pool", skipped)
 
-            for p in papers:
-                pid = self._make_id(p["title"], p["arxiv"], p["year"])
-                self.pool.add_paper(
-                    pid=pid,
-                    title=p["title"],
-                    summary=p["summary"],
-                    year=p["year"],
-                    arxiv=p["arxiv"],
-                )
+            # checkpoint fully consumed pages so an interrupted run resumes after
+            # them (add_papers raises on failure, so nothing lost is checkpointed)
+            for page, added in complete:
+                self.pool.mark_page_done(query, page, added)
 
             logger.info("Pool now has %d papers", self.pool.remaining_count())
 
     # ----------------------------------------------------------
     # FINAL: landmark bootstrap
     # ----------------------------------------------------------
-    def bootstrap_default(self, target_size: int = 300):
+    def bootstrap_default(self, target_size: int = 300, resume: bool = True):
         """
         Build landmark pool (ATLAS/CMS/CDF/D0/LHCb, Super-K/T2K/MINOS/NOvA,
         Belle/Belle-II/BaBar). Each query is real INSPIRE syntax.
+
+        With resume=True pages checkpointed by an earlier (possibly
+        interrupted) run are skipped; resume=False starts over.
         """
 
         logger.info("INSPIRE bootstrap to target=%d", target_size)
+        if not resume:
+            self.pool.reset_progress()
 
         # collider (LHC + Tevatron)
         collider = (
@@ -50,7 +50,7 @@ Papers:
 
         logger.info("KeywordEngine: Generating recommended arXiv filter keywords via AI.")
 
-        out = AI.ask(prompt, ttl=ttl)
+        out = AI.model("gpt-4o").ask(prompt, ttl=ttl, name="keyword_engine")
         if not out:
             logger.warning("KeywordEngine: GPT returned empty result; using base keywords.")
             return self.base_keywords
@@ -1,25 +1,156 @@
+import asyncio
+import contextvars
 import logging
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
+import httpx
 from openai import OpenAI
 from flowc.config import Config
-from flowc.ai.cache import cache_get, cache_set  #
+from flowc.ai.batching import estimate_tokens
+from flowc.ai.cache import CACHE_DIR, _key, cache_lookup, cache_set
+from flowc.ai.rate_limiter import limiter_for
+from flowc.ai.singleflight import SingleFlight
+from flowc.ai.telemetry import record_call
 
 logger = logging.getLogger(__name__)
 
+_inflight = SingleFlight(CACHE_DIR / "locks")
+
+
+class AIModel:
+    """
+    Immutable handle bound to one model name.
+
+    Cheap to create; every handle shares AI's client and connection pool,
+    so `AI.model("gpt-5.1")` never affects another caller's model.
+    """
+
+    __slots__ = ("_name",)
+
+    def __init__(self, name: str):
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def __repr__(self):
+        return f"AIModel({self._name!r})"
+
+    def ask(self, prompt: str, **kwargs):
+        return AI._ask(self._name, prompt, **kwargs)
+
+    def ask_many(self, prompts: list[str], **kwargs) -> list[str]:
+        return AI._ask_many(self._name, prompts, **kwargs)
+
+    def ask_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        return AI._ask_stream(self._name, prompt, **kwargs)
+
+    async def ask_async(self, prompt: str, **kwargs):
+        return await AI._ask_async(self._name, prompt, **kwargs)
+
 
 class AI:
-    client = OpenAI(api_key=Config.OPENAI_API_KEY)
-    model_name = "gpt-4o"
+    client = None  # built lazily by get_client()
+    model_name = "gpt-4o"  # default model for AI.ask / AI.ask_many
+    max_workers = Config.AI_MAX_WORKERS
+
+    _client_lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls) -> OpenAI:
+        """
+        Return the process-wide OpenAI client, backed by one explicitly
+        sized keep-alive connection pool.
+        """
+        if cls.client is None:
+            with cls._client_lock:
+                if cls.client is None:
+                    pool = Config.OPENAI_POOL_SIZE
+                    cls.client = OpenAI(
+                        api_key=Config.OPENAI_API_KEY,
+                        timeout=Config.OPENAI_TIMEOUT,
+                        max_retries=0,  # retries and back-off live in _complete
+
+                        http_client=httpx.Client(
+                            limits=httpx.Limits(
+                                max_connections=pool,
+                                max_keepalive_connections=pool,
+                                keepalive_expiry=60.0,
+                            ),
+                            timeout=Config.OPENAI_TIMEOUT,
+                        ),
+                    )
+        return cls.client
+
+    @classmethod
+    def model(cls, name: str) -> AIModel:
+        return AIModel(name)
+
+    @classmethod
+    def ask(cls, prompt: str, **kwargs):
+        return cls._ask(cls.model_name, prompt, **kwargs)
+
+    @classmethod
+    def ask_many(cls, prompts: list[str], **kwargs) -> list[str]:
+        return cls._ask_many(cls.model_name, prompts, **kwargs)
+
+    @classmethod
+    def ask_stream(cls, prompt: str, **kwargs) -> Iterator[str]:
+        return cls._ask_stream(cls.model_name, prompt, **kwargs)
 
     @classmethod
-    def model(cls, name: str):
-        cls.model_name = name
-        return cls
+    async def ask_async(cls, prompt: str, **kwargs):
+        return await cls._ask_async(cls.model_name, prompt, **kwargs)
+
+    @classmethod
+    async def _ask_async(cls, model_name: str, prompt: str, **kwargs):
+        """
+        ask() for event-loop callers. The call runs on a worker thread so it
+        keeps the shared cache, single-flight, rate limiter and telemetry
+        (the flow_run context is carried over by to_thread).
+        """
+        return await asyncio.to_thread(cls._ask, model_name, prompt, **kwargs)
+
+    @classmethod
+    def _ask_many(
+        cls,
+        model_name: str,
+        prompts: list[str],
+        *,
+        max_workers: int | None = None,
+        **kwargs,
+    ) -> list[str]:
+        """
+        Run several prompts concurrently against one model.
+
+        Each prompt goes through the same cache lookup and retry loop as
+        ask(); results are returned in the order of `prompts`.
+        """
+        if not prompts:
+            return []
+
+        workers = max(1, min(max_workers or cls.max_workers, len(prompts)))
+
+        logger.info(
+            "AI.ask_many: %d prompt(s) on %s with %d worker(s)",
+            len(prompts), model_name, workers,
+        )
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="flowc-ai") as pool:
+            # copy the caller's context so telemetry keeps the flow run
+            futures = [
+                pool.submit(contextvars.copy_context().run, cls._ask, model_name, p, **kwargs)
+                for p in prompts
+            ]
+            return [f.result() for f in futures]
 
     @classmethod
-    def ask(
+    def _ask(
         cls,
+        model_name: str,
         prompt: str,
         *,
         retries: int = 3,
@@ -28,25 +159,83 @@ class AI:
         ttl: int | None = None,
         use_cache: bool = True,
         max_completion_tokens: int = 1500,
+        name: str | None = None,
         **kwargs,
     ):
-        cached = None
-        if use_cache and ttl and ttl > 0:
-            cached = cache_get(cls.model_name, prompt, ttl)
+        cacheable = use_cache and ttl and ttl > 0
+        started = time.monotonic()
+
+        cached = tier = None
+        if cacheable:
+            cached, tier = cache_lookup(model_name, prompt, ttl)
         if cached is not None:
             logger.info("Cached prompt exists. using cached one.")
+            record_call(
+                model=model_name, prompt_name=name,
+                latency=time.monotonic() - started, cache=tier,
+            )
+            return cached
+
+        def recheck():
+            # another process may have answered while we waited for the lock
+            cached, tier = cache_lookup(model_name, prompt, ttl)
+            if cached is not None:
+                logger.info("Prompt was answered by another process. using cached one.")
+                record_call(
+                    model=model_name, prompt_name=name,
+                    latency=time.monotonic() - started, cache=tier,
+                )
             return cached
 
+        # identical prompts in flight share one model call
+        return _inflight.do(
+            _key(model_name, prompt),
+            lambda: cls._complete(
+                model_name,
+                prompt,
+                retries=retries,
+                retry_delay=retry_delay,
+                fallback=fallback,
+                ttl=ttl if cacheable else None,
+                max_completion_tokens=max_completion_tokens,
+                name=name,
+                **kwargs,
+            ),
+            cross_process=bool(cacheable),
+            recheck=recheck if cacheable else None,
+        )
+
+    @classmethod
+    def _complete(
+        cls,
+        model_name: str,
+        prompt: str,
+        *,
+        retries: int,
+        retry_delay: float,
+        fallback: str,
+        ttl: int | None,
+        max_completion_tokens: int,
+        name: str | None = None,
+        **kwargs,
+    ):
+        started = time.monotonic()
+        limiter = limiter_for(model_name)
+        reserved = estimate_tokens(prompt) + max_completion_tokens
+
         last_error = None
         for attempt in range(1, retries + 1):
             try:
-                r = cls.client.chat.completions.create(
-                    model=cls.model_name,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3,
-                    max_completion_tokens=max_completion_tokens,
-                    **kwargs,
-                )
+                with limiter.slot(reserved):
+                    r = cls.get_client().chat.completions.create(
+                        model=model_name,
+                        messages=[{"role": "user", "content": prompt}],
+                        temperature=0.3,
+                        max_completion_tokens=max_completion_tokens,
+                        **kwargs,
+                    )
+                usage = getattr(r, "usage", None)
+                limiter.on_success(reserved, getattr(usage, "total_tokens", None))
 
                 msg = r.choices[0].message
                 out = msg.content
@@ -58,14 +247,22 @@ class AI:
                     )
                     continue
 
-                if use_cache and ttl and ttl > 0:
-                    cache_set(cls.model_name, prompt, out)
+                if ttl:
+                    cache_set(model_name, prompt, out)
                     logger.info(
                         "The prompt is cached (vaild for %d seconds).", ttl
                     )
                 else:
                     logger.info("The prompt is not cached (ttl=%r).", ttl)
 
+                record_call(
+                    model=model_name,
+                    prompt_name=name,
+                    latency=time.monotonic() - started,
+                    attempts=attempt,
+                    input_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                    output_tokens=getattr(usage, "completion_tokens", 0) or 0,
+                )
                 return out
 
             except Exception as exc:
@@ -73,8 +270,140 @@ class AI:
                 logger.warning(
                     "AI call failed (attempt %s/%s): %s", attempt, retries, exc
                 )
+                delay = limiter.on_error(exc, retry_delay * attempt)
                 if attempt < retries:
-                    time.sleep(retry_delay * attempt)
+                    time.sleep(delay)
 
         logger.error("AI call failed after %s attempts: %s", retries, last_error)
+        record_call(
+            model=model_name, prompt_name=name,
+            latency=time.monotonic() - started, attempts=retries, ok=False,
+        )
         return fallback
+
+    @classmethod
+    def _ask_stream(
+        cls,
+        model_name: str,
+        prompt: str,
+        *,
+        retries: int = 3,
+        retry_delay: float = 1.0,
+        fallback: str = "(AI call failed)",
+        ttl: int | None = None,
+        use_cache: bool = True,
+        max_completion_tokens: int = 1500,
+        timeout: float | None = None,
+        stall_timeout: float | None = None,
+        name: str | None = None,
+        **kwargs,
+    ) -> Iterator[str]:
+        """
+        Yield the completion as text deltas.
+
+        A cached answer is yielded in one piece. The assembled text is
+        cached only when the stream finishes normally. `stall_timeout`
+        bounds the wait for the next chunk, `timeout` the whole generation;
+        either one cuts a stalled stream short (the partial text is kept,
+        but not cached). Retries only happen before the first delta.
+        """
+        cacheable = use_cache and ttl and ttl > 0
+        started = time.monotonic()
+
+        if cacheable:
+            cached, tier = cache_lookup(model_name, prompt, ttl)
+            if cached is not None:
+                logger.info("Cached prompt exists. using cached one.")
+                record_call(
+                    model=model_name, prompt_name=name,
+                    latency=time.monotonic() - started, cache=tier,
+                )
+                yield cached
+                return
+
+        stall = stall_timeout or Config.AI_STREAM_STALL_TIMEOUT
+        deadline = time.monotonic() + timeout if timeout else None
+        client = cls.get_client().with_options(
+            timeout=httpx.Timeout(Config.OPENAI_TIMEOUT, read=stall)
+        )
+
+        limiter = limiter_for(model_name)
+        reserved = estimate_tokens(prompt) + max_completion_tokens
+
+        parts: list[str] = []
+        usage = None
+        attempt = 0
+
+        def record(ok: bool):
+            record_call(
+                model=model_name,
+                prompt_name=name,
+                latency=time.monotonic() - started,
+                attempts=attempt,
+                input_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                output_tokens=getattr(usage, "completion_tokens", 0) or 0,
+                ok=ok,
+            )
+
+        last_error = None
+        for attempt in range(1, retries + 1):
+            try:
+                with limiter.slot(reserved):
+                    stream = client.chat.completions.create(
+                        model=model_name,
+                        messages=[{"role": "user", "content": prompt}],
+                        temperature=0.3,
+                        max_completion_tokens=max_completion_tokens,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                        **kwargs,
+                    )
+                    with stream:
+                        for chunk in stream:
+                            if getattr(chunk, "usage", None):
+                                usage = chunk.usage
+                            if not chunk.choices:
+                                continue
+                            delta = chunk.choices[0].delta.content
+                            if delta:
+                                parts.append(delta)
+                                yield delta
+                            if deadline and time.monotonic() > deadline:
+                                logger.warning(
+                                    "AI.ask_stream: cut off after %.1fs (%d chars so far)",
+                                    timeout, sum(len(p) for p in parts),
+                                )
+                                record(False)
+                                return
+                limiter.on_success(reserved, getattr(usage, "total_tokens", None))
+
+                out = "".join(parts)
+                if not out:
+                    logger.error("AI.ask_stream: stream finished without content")
+                    continue
+
+                if cacheable:
+                    cache_set(model_name, prompt, out)
+                    logger.info(
+                        "The prompt is cached (vaild for %d seconds).", ttl
+                    )
+                record(True)
+                return
+
+            except Exception as exc:
+                last_error = exc
+                if parts:
+                    # text was already handed out; a retry would duplicate it
+                    logger.warning("AI.ask_stream: stream broke mid-way: %s", exc)
+                    record(False)
+                    return
+                logger.warning(
+                    "AI stream failed (attempt %s/%s): %s", attempt, retries, exc
+                )
+                delay = limiter.on_error(exc, retry_delay * attempt)
+                if attempt < retries:
+                    time.sleep(delay)
+
+        logger.error("AI stream failed after %s attempts: %s", retries, last_error)
+        record(False)
+        yield fallback
@@ -1,15 +1,116 @@
+import hashlib
+import logging
 import os
+import string
+import threading
+import time
+
+from flowc.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class PromptTemplate:
+    """
+    One compiled prompt: its text, the placeholder names it needs and a
+    content hash that changes whenever the file does.
+    """
+
+    __slots__ = ("name", "path", "text", "fields", "hash", "mtime", "checked_at")
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self.checked_at = time.monotonic()
+
+        with open(path, "r", encoding="utf-8") as f:
+            self.text = f.read()
+
+        try:
+            parsed = list(string.Formatter().parse(self.text))
+        except ValueError as exc:
+            raise ValueError(f"prompt {name!r} is not a valid format string: {exc}") from exc
+
+        fields = set()
+        for _, field, _, _ in parsed:
+            if field is None:
+                continue
+            root = field.split(".", 1)[0].split("[", 1)[0]
+            if not root or root.isdigit():
+                raise ValueError(f"prompt {name!r} uses a positional placeholder {{{field}}}")
+            fields.add(root)
+
+        self.fields = frozenset(fields)
+        self.hash = hashlib.sha256(self.text.encode("utf-8")).hexdigest()[:16]
+
+    def format(self, **kwargs) -> str:
+        missing = self.fields - kwargs.keys()
+        if missing:
+            raise KeyError(f"prompt {self.name!r} missing field(s): {', '.join(sorted(missing))}")
+        return self.text.format(**kwargs)
+
 
 class PromptManager:
     BASE = os.path.join(os.path.dirname(__file__), "prompts")
 
+    _registry: dict[str, PromptTemplate] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, name: str) -> PromptTemplate:
+        """
+        Compiled template, read from disk on first use. With
+        PROMPT_RELOAD_INTERVAL > 0 the file's mtime is re-checked at most
+        that often and a changed file is recompiled.
+        """
+        tpl = cls._registry.get(name)
+        if tpl is not None and not cls._stale(tpl):
+            return tpl
+
+        with cls._lock:
+            current = cls._registry.get(name)
+            if current is not None and current is not tpl:
+                return current  # another thread (re)compiled it meanwhile
+
+            if tpl is not None:
+                logger.info("Prompt %s changed on disk; reloading", name)
+            tpl = PromptTemplate(name, os.path.join(cls.BASE, f"{name}.txt"))
+            cls._registry[name] = tpl
+        return tpl
+
+    @staticmethod
+    def _stale(tpl: PromptTemplate) -> bool:
+        interval = Config.PROMPT_RELOAD_INTERVAL
+        if interval <= 0:
+            return False
+        now = time.monotonic()
+        if now - tpl.checked_at < interval:
+            return False
+        tpl.checked_at = now
+        try:
+            return os.path.getmtime(tpl.path) != tpl.mtime
+        except OSError:
+            return False
+
+    @classmethod
+    def preload(cls) -> dict[str, PromptTemplate]:
+        """Compile and validate every prompt in BASE now (fail fast at startup)."""
+        for fn in sorted(os.listdir(cls.BASE)):
+            if fn.endswith(".txt"):
+                cls.get(fn[:-len(".txt")])
+        logger.info("Loaded %d prompt template(s)", len(cls._registry))
+        return dict(cls._registry)
+
     @staticmethod
     def load(name: str):
-        path = os.path.join(PromptManager.BASE, f"{name}.txt")
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
+        return PromptManager.get(name).text
+
+    @staticmethod
+    def hash(name: str) -> str:
+        """Content hash of the current template version (for cache keys)."""
+        return PromptManager.get(name).hash
 
     @staticmethod
     def format(name: str, **kwargs):
-        template = PromptManager.load(name)
-        return template.format(**kwargs)
+        return PromptManager.get(name).format(**kwargs)
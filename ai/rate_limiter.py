@@ -0,0 +1,204 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from flowc.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `capacity` tokens, refilled continuously at
+    `capacity / period` per second.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self, amount: float):
+        # a single request larger than the bucket would wait forever
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(min(wait, 5.0))
+
+    def refund(self, amount: float):
+        """Give back tokens that were reserved but not used (or take more)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limit: +1 slot per window of successes, halved on a
+    rate-limit response.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self):
+        with self._cond:
+            if self.limit < self.maximum:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+                self._cond.notify()
+
+    def on_throttle(self):
+        with self._cond:
+            new = max(self.minimum, self.limit / 2)
+            if int(new) < int(self.limit):
+                logger.info("AI concurrency limit lowered to %d", int(new))
+            self.limit = new
+
+
+def _seconds(value: str) -> float | None:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None  # e.g. an HTTP date: fall back to normal backoff
+
+
+def retry_after(exc: Exception) -> float | None:
+    """
+    Server retry delay (seconds) from retry-after-ms / retry-after.
+    The x-ratelimit-reset-* headers are quota window resets, not retry
+    delays, and are ignored.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    if headers.get("retry-after-ms"):
+        hint = _seconds(headers["retry-after-ms"])
+        return hint / 1000 if hint is not None else None
+    if headers.get("retry-after"):
+        return _seconds(headers["retry-after"])
+    return None
+
+
+def is_rate_limited(exc: Exception) -> bool:
+    return getattr(exc, "status_code", None) == 429 or type(exc).__name__ == "RateLimitError"
+
+
+class ModelLimiter:
+    """Requests/minute, tokens/minute and adaptive concurrency for one model."""
+
+    def __init__(self, model: str, rpm: int, tpm: int, max_concurrency: int):
+        self.model = model
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = AdaptiveConcurrency(
+            initial=max(1, max_concurrency // 2),
+            maximum=max_concurrency,
+        )
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_pause(self):
+        while True:
+            with self._lock:
+                wait = self._paused_until - time.monotonic()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self, estimated_tokens: int):
+        """Hold one request slot, charged `estimated_tokens` up front."""
+        self._wait_pause()
+        self.concurrency.acquire()
+        try:
+            self.requests.acquire(1)
+            self.tokens.acquire(estimated_tokens)
+            yield
+        finally:
+            self.concurrency.release()
+
+    def on_success(self, estimated_tokens: int, used_tokens: int | None):
+        self.concurrency.on_success()
+        if used_tokens:
+            self.tokens.refund(estimated_tokens - used_tokens)
+
+    def on_error(self, exc: Exception, default_delay: float) -> float:
+        """
+        Return how long this caller should sleep before retrying. Only
+        rate-limit (429) errors honour the server's retry hint; they also
+        pause every other caller of this model and shrink the concurrency
+        limit. Other errors use the caller's normal backoff.
+        """
+        if not is_rate_limited(exc):
+            return default_delay
+
+        self.concurrency.on_throttle()
+        hint = retry_after(exc)
+        delay = hint if hint is not None else default_delay
+        # jitter so paused callers do not all retry in the same instant
+        delay *= 1 + random.uniform(0, 0.25)
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning("AI rate limited on %s; backing off %.1fs", self.model, delay)
+        return delay
+
+
+def _configured_limits() -> dict[str, tuple[int, int]]:
+    """AI_RATE_LIMITS='gpt-4o=500:30000,gpt-5.1=500:30000' -> {model: (rpm, tpm)}"""
+    limits = {}
+    for item in (Config.AI_RATE_LIMITS or "").split(","):
+        if "=" not in item:
+            continue
+        model, _, spec = item.partition("=")
+        rpm, _, tpm = spec.partition(":")
+        try:
+            limits[model.strip()] = (int(rpm), int(tpm))
+        except ValueError:
+            logger.warning("Ignoring malformed AI_RATE_LIMITS entry: %r", item)
+    return limits
+
+
+_limiters: dict[str, ModelLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(model: str) -> ModelLimiter:
+    """Process-wide limiter for `model`."""
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            rpm, tpm = _configured_limits().get(model, (Config.AI_RPM, Config.AI_TPM))
+            limiter = ModelLimiter(model, rpm, tpm, Config.AI_MAX_CONCURRENCY)
+            _limiters[model] = limiter
+        return limiter
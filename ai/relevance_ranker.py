@@ -0,0 +1,189 @@
+import logging
+import re
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from flowc.ai.keyword_engine import DEFAULT_BASE_KEYWORDS
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from has have in is it its of on or that the
+    their this to was we were which with using use used new study results
+    result show shows present presented paper based also can these than
+    """.split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase unigrams plus adjacent bigrams ("belle ii", "form factor")."""
+    words = [w for w in _TOKEN_RE.findall(text.lower()) if w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class RelevanceRanker:
+    """
+    Local BM25 relevance of new papers against the reading history.
+
+    The history (papers already archived in PaperDatabase, plus the seed
+    keywords) forms a profile: the mean term frequency of every history
+    paper, with seed terms boosted. Candidates are BM25-weighted against
+    the IDF of history + candidates and scored by cosine similarity to the
+    IDF-weighted profile, all as sparse matrix products.
+
+    add() folds one more archived paper into the counts, so the index
+    stays current without a rebuild. Candidates are scored against the
+    history vocabulary only: terms never archived are ignored and never
+    enter the index.
+    """
+
+    def __init__(self, seed_keywords=None, *, k1: float = 1.5, b: float = 0.75, seed_weight: float = 3.0):
+        self.k1 = k1
+        self.b = b
+        self.seed_weight = seed_weight
+        self.seed_keywords = list(seed_keywords or DEFAULT_BASE_KEYWORDS)
+
+        self.vocab: dict[str, int] = {}
+        self._df = np.zeros(1024, dtype=np.float64)       # history document frequency
+        self._profile = np.zeros(1024, dtype=np.float64)  # summed normalized tf
+        self._seed = np.zeros(1024, dtype=np.float64)
+        self.n_docs = 0
+        self._lock = threading.Lock()
+
+        for kw in self.seed_keywords:
+            for term in tokenize(kw):
+                self._seed[self._term_id(term)] = 1.0
+
+    @classmethod
+    def from_database(cls, db, seed_keywords=None) -> "RelevanceRanker":
+        """
+        Load the counts persisted in `db`, fold in papers archived since
+        they were saved, and persist that increment. Only a first run
+        tokenizes the whole archive.
+        """
+        ranker = cls(seed_keywords)
+        terms, ranker.n_docs, last_rowid = db.load_ranker_state()
+        if terms:
+            ids = np.array([ranker._term_id(t) for t, _, _ in terms])
+            ranker._df[ids] = [df for _, df, _ in terms]
+            ranker._profile[ids] = [tf for _, _, tf in terms]
+
+        papers = db.fetch_since(last_rowid)
+        if papers:
+            n_terms = len(ranker.vocab)
+            df0, profile0 = ranker._df[:n_terms].copy(), ranker._profile[:n_terms].copy()
+            for p in papers:
+                ranker.add(p["title"], p["summary"])
+
+            vocab = list(ranker.vocab)
+            df = ranker._df[:len(vocab)].copy()
+            profile = ranker._profile[:len(vocab)].copy()
+            df[:n_terms] -= df0
+            profile[:n_terms] -= profile0
+            changed = np.flatnonzero(df)
+            db.save_ranker_state(
+                [(vocab[i], int(df[i]), float(profile[i])) for i in changed],
+                ranker.n_docs,
+                papers[-1]["rowid"],
+                since=last_rowid,
+            )
+
+        logger.info(
+            "RelevanceRanker: %d archived paper(s) (%d new), %d terms",
+            ranker.n_docs, len(papers), len(ranker.vocab),
+        )
+        return ranker
+
+    # ----------------------------------------------------------
+    # index maintenance
+    # ----------------------------------------------------------
+    def _term_id(self, term: str) -> int:
+        tid = self.vocab.get(term)
+        if tid is None:
+            tid = len(self.vocab)
+            self.vocab[term] = tid
+            if tid >= len(self._df):
+                grow = len(self._df)
+                self._df = np.concatenate([self._df, np.zeros(grow)])
+                self._profile = np.concatenate([self._profile, np.zeros(grow)])
+                self._seed = np.concatenate([self._seed, np.zeros(grow)])
+        return tid
+
+    def add(self, title: str, summary: str):
+        """Fold one archived paper into the history counts."""
+        terms = tokenize(f"{title} {summary}")
+        if not terms:
+            return
+        with self._lock:
+            ids, counts = np.unique([self._term_id(t) for t in terms], return_counts=True)
+            self._df[ids] += 1
+            self._profile[ids] += counts / len(terms)
+            self.n_docs += 1
+
+    # ----------------------------------------------------------
+    # scoring
+    # ----------------------------------------------------------
+    def _matrix(self, papers: list[dict]) -> tuple[sparse.csr_matrix, np.ndarray]:
+        """Term counts over the known vocabulary, plus each full document length."""
+        rows, cols, vals = [], [], []
+        lengths = np.zeros(len(papers))
+        for i, p in enumerate(papers):
+            terms = tokenize(f"{p['title']} {p['summary']}")
+            lengths[i] = len(terms)
+            known = [tid for tid in map(self.vocab.get, terms) if tid is not None]
+            if not known:
+                continue
+            ids, counts = np.unique(known, return_counts=True)
+            rows.append(np.full(len(ids), i))
+            cols.append(ids)
+            vals.append(counts)
+
+        shape = (len(papers), len(self.vocab))
+        if not rows:
+            return sparse.csr_matrix(shape), lengths
+        tf = sparse.csr_matrix(
+            (np.concatenate(vals).astype(np.float64), (np.concatenate(rows), np.concatenate(cols))),
+            shape=shape,
+        )
+        return tf, lengths
+
+    def score(self, papers: list[dict]) -> np.ndarray:
+        """Relevance in [0, 1] for each paper (cosine to the history profile)."""
+        if not papers:
+            return np.zeros(0)
+
+        with self._lock:
+            tf, dl = self._matrix(papers)
+            n_terms = len(self.vocab)
+            df = self._df[:n_terms] + (tf > 0).sum(axis=0).A1
+            n = self.n_docs + len(papers)
+
+            # BM25 idf (always positive) and length-normalized tf saturation
+            idf = np.log1p((n - df + 0.5) / (df + 0.5))
+            avgdl = dl.mean() or 1.0
+            norm = self.k1 * (1 - self.b + self.b * dl / avgdl)
+
+            bm25 = tf.tocoo()
+            data = bm25.data * (self.k1 + 1) / (bm25.data + norm[bm25.row])
+            docs = sparse.csr_matrix((data * idf[bm25.col], (bm25.row, bm25.col)), shape=tf.shape)
+
+            profile = self._profile[:n_terms] / max(self.n_docs, 1)
+            profile = profile + self.seed_weight * self._seed[:n_terms] * profile.max(initial=0.0)
+            if not profile.any():
+                profile = self._seed[:n_terms].copy()
+            query = profile * idf
+
+        doc_norms = np.sqrt(docs.multiply(docs).sum(axis=1).A1)
+        q_norm = np.linalg.norm(query)
+        if q_norm == 0:
+            return np.zeros(len(papers))
+
+        scores = docs @ query
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = np.where(doc_norms > 0, scores / (doc_norms * q_norm), 0.0)
+        return scores
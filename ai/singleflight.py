@@ -0,0 +1,117 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: in-process coalescing only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key.
+
+    Inside a process the first caller runs the function and later callers
+    wait on its future. With `cross_process=True` the leader also holds an
+    advisory lock file, so a leader in another process on the same host
+    waits until the first one is done (and can then read its cached result).
+    There is one lock file per key, removed again by the leader, so
+    unrelated prompts never wait on each other.
+    """
+
+    def __init__(self, lock_dir: Path, lock_timeout: float = 600.0):
+        self.lock_dir = Path(lock_dir)
+        self.lock_timeout = lock_timeout
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn, *, cross_process: bool = False, recheck=None):
+        """
+        Run fn() once per in-flight key and return its result to every caller.
+
+        recheck() is called by a cross-process leader after it acquires the
+        lock file; a non-None value is returned without calling fn().
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            logger.info("Identical prompt already in flight; waiting for its result.")
+            return future.result()
+
+        try:
+            if cross_process and fcntl is not None:
+                with self._file_lock(key):
+                    result = recheck() if recheck else None
+                    if result is None:
+                        result = fn()
+            else:
+                result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    @contextmanager
+    def _file_lock(self, key: str):
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        path = self.lock_dir / f"{key}.lock"
+        fd = self._acquire(path)
+        try:
+            yield
+        finally:
+            if fd is not None:
+                # unlink while still holding the lock: a waiter that locks the
+                # old inode afterwards notices and retries on a fresh file
+                path.unlink(missing_ok=True)
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def _acquire(self, path: Path) -> int | None:
+        """Locked fd for `path`, or None once lock_timeout has passed."""
+        deadline = time.monotonic() + self.lock_timeout
+        waited = False
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                if time.monotonic() >= deadline:
+                    logger.warning(
+                        "SingleFlight: lock %s still held after %.0fs; proceeding without it",
+                        path.name, self.lock_timeout,
+                    )
+                    return None
+                if not waited:
+                    logger.info("Prompt is being computed by another process; waiting.")
+                    waited = True
+                time.sleep(0.1)
+                continue
+
+            # the previous holder may have unlinked the file we locked
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+            st = os.fstat(fd)
+            if current is not None and (current.st_ino, current.st_dev) == (st.st_ino, st.st_dev):
+                return fd
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
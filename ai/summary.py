@@ -1,5 +1,119 @@
+import hashlib
+import json
+import logging
+
+from flowc.config import Config
+from flowc.connectors.arxiv_api import normalize_arxiv_id
+
+from .batching import estimate_tokens, plan_batches
+from .cache import cache_lookup, cache_set
 from .openai_client import AI
 from .prompt_manager import PromptManager
+from .telemetry import record_call
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_MODES = ("notion", "telegram", "email")
+
+
+# -------------------------------------------------------------------------
+# Multi-variant completion
+# -------------------------------------------------------------------------
+def _cached(model: str, prompt: str, ttl: int, name: str) -> str | None:
+    """Cache lookup that shows up in telemetry like an AI.ask cache hit."""
+    out, tier = cache_lookup(model, prompt, ttl)
+    if out is not None:
+        record_call(model=model, prompt_name=name, latency=0.0, cache=tier)
+    return out
+
+
+def _strip_fence(out: str) -> str:
+    text = out.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    return text
+
+
+def _parse_variants(out: str, modes) -> dict[str, str] | None:
+    """Validate {"<mode>": "<text>", ...}; return None if anything is off."""
+    text = _strip_fence(out)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+
+    if not isinstance(data, dict) or set(data) != set(modes):
+        return None
+
+    variants = {}
+    for mode in modes:
+        value = data[mode]
+        if not isinstance(value, str) or not value.strip():
+            return None
+        variants[mode] = value.strip()
+    return variants
+
+
+def _ask_variants(prefix: str, field: str, value: str, modes, *, model: str, ttl: int) -> dict[str, str]:
+    """
+    Produce `<prefix>_<mode>` outputs for every mode from a single completion.
+
+    Each variant is cached under the key of its own per-mode prompt, so the
+    single-mode helpers and later runs share the same entries. Per-mode
+    prompts are only sent when the combined answer fails validation.
+    """
+    prompts = {
+        mode: PromptManager.format(f"{prefix}_{mode}", **{field: value})
+        for mode in modes
+    }
+
+    results = {}
+    for mode, prompt in prompts.items():
+        cached = _cached(model, prompt, ttl, f"{prefix}_{mode}")
+        if cached is not None:
+            results[mode] = cached
+
+    missing = [mode for mode in modes if mode not in results]
+    if len(missing) > 1:
+        blocks = [
+            f'=== VARIANT "{mode}" ===\n'
+            + PromptManager.format(f"{prefix}_{mode}", **{field: "(see INPUT below)"}).strip()
+            for mode in missing
+        ]
+        prompt = PromptManager.format(
+            "multi_variant",
+            keys=", ".join(f'"{mode}"' for mode in missing),
+            variants="\n\n".join(blocks),
+            input=value,
+        )
+        out = AI.model(model).ask(
+            prompt,
+            name=f"{prefix}_multi",
+            fallback="",
+            use_cache=False,
+            max_completion_tokens=1500 * len(missing),
+            response_format={"type": "json_object"},
+        )
+
+        variants = _parse_variants(out, missing)
+        if variants is None:
+            logger.warning(
+                "Multi-variant %s output failed validation; falling back to per-mode prompts",
+                prefix,
+            )
+        else:
+            for mode, text in variants.items():
+                cache_set(model, prompts[mode], text)
+            results.update(variants)
+            missing = []
+
+    if missing:
+        outs = AI.model(model).ask_many(
+            [prompts[mode] for mode in missing], ttl=ttl, name=prefix,
+        )
+        results.update(zip(missing, outs))
+
+    return {mode: results[mode] for mode in modes}
 
 
 # -------------------------------------------------------------------------
@@ -8,48 +122,276 @@ from .prompt_manager import PromptManager
 def summarize_commits(raw: str, mode="notion") -> str:
     prompt_name = f"commit_summary_{mode}"
     prompt = PromptManager.format(prompt_name, commits=raw)
-    return AI.model("gpt-4o").ask(prompt, ttl=7200)  # 2 hours
+    return AI.model("gpt-4o").ask(prompt, ttl=7200, name=prompt_name)  # 2 hours
+
+
+def summarize_commits_many(raw: str, modes=CHANNEL_MODES) -> dict[str, str]:
+    """Summarize the same commit log for several modes in one completion."""
+    return _ask_variants("commit_summary", "commits", raw, modes, model="gpt-4o", ttl=7200)
 
 
 # -------------------------------------------------------------------------
 # Arxiv Summaries
 # -------------------------------------------------------------------------
-def summarize_arxiv(papers: list[dict], mode="email") -> list[str]:
-    """
-    Return a list of summaries, one per paper.
-    - email : multi-sentence summaries (2-4 sentences)
-    - telegram : ultra-compact 1-line summaries
-    """
+ARXIV_MODEL = "gpt-5.1"
+ARXIV_TTL = 30 * 86400  # a paper's summary does not go stale
+
+# rough output cost of one paper's summary, per mode
+ARXIV_OUTPUT_TOKENS = {"email": 160, "telegram": 40}
+
 
+def _arxiv_block(i: int, p: dict) -> str:
+    return f"[{i}] {p['title']}\n{p['summary']}"
+
+
+def _arxiv_prompt(papers: list[dict], mode: str) -> str:
     # build per-paper blocks
     blocks = []
     for i, p in enumerate(papers, start=1):
-        blocks.append(f"[{i}] {p['title']}\n{p['summary']}")
+        blocks.append(_arxiv_block(i, p))
 
     prompt_name = f"arxiv_summary_{mode}"
-    prompt = PromptManager.format(
+    return PromptManager.format(
         prompt_name,
         papers="\n\n".join(blocks),
         count=len(papers)
     )
 
-    model = "gpt-5.1"
-    out = AI.model(model).ask(prompt).strip()
 
-    # Split into lines or blocks
-    lines = [x.strip() for x in out.split("\n") if x.strip()]
+def _arxiv_cache_prompt(p: dict, mode: str) -> str:
+    """
+    Content-addressed cache key for one paper's summary: arXiv id, a hash of
+    title + abstract, and a hash of the template that produced it.
+    """
+    prompt_name = f"arxiv_summary_{mode}"
+    template = PromptManager.hash(prompt_name)
+    content = hashlib.sha256(f"{p['title']}\n{p['summary']}".encode()).hexdigest()
+    return f"{prompt_name}\n{normalize_arxiv_id(p['id'])}\n{content}\n{template}"
+
+
+def _parse_indexed(out: str, count: int) -> dict[int, str]:
+    """
+    Parse {"summaries": [{"i": n, "summary": "..."}]} (or a bare list).
+    Return {index: summary} for the items that are well-formed.
+    """
+    text = _strip_fence(out)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+
+    items = data.get("summaries") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return {}
+
+    parsed = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        i, summary = item.get("i"), item.get("summary")
+        if isinstance(i, str) and i.strip("[] ").isdigit():
+            i = int(i.strip("[] "))
+        if not isinstance(i, int) or not 1 <= i <= count:
+            continue
+        if not isinstance(summary, str) or not summary.strip():
+            continue
+        parsed[i] = summary.strip()
+    return parsed
 
-    # Telegram: exactly count lines
-    if mode == "telegram" and len(lines) == len(papers):
-        return lines
 
-    # Email: paragraphs separated by blank lines
-    para_blocks = [x.strip() for x in out.split("\n\n") if x.strip()]
-    if mode == "email" and len(para_blocks) == len(papers):
-        return para_blocks
+def _ask_arxiv(jobs: list[tuple[str, list[int]]], papers: list[dict]) -> dict[tuple[str, int], str]:
+    """
+    Run (mode, paper indices) jobs concurrently, one prompt per job.
+    Return {(mode, paper index): summary} for every item that parsed.
+    """
+    prompts = [_arxiv_prompt([papers[j] for j in idx], mode) for mode, idx in jobs]
+    outs = AI.model(ARXIV_MODEL).ask_many(
+        prompts,
+        name="arxiv_summary",
+        fallback="",
+        max_completion_tokens=Config.ARXIV_MAX_OUTPUT_TOKENS,
+        response_format={"type": "json_object"},
+    )
 
-    # Fallback: duplicate entire output for all papers (never breaks flow)
-    return [out] * len(papers)
+    results = {}
+    for (mode, idx), out in zip(jobs, outs):
+        parsed = _parse_indexed(out, len(idx))
+        for i, j in enumerate(idx, start=1):
+            if i in parsed:
+                results[(mode, j)] = parsed[i]
+    return results
+
+
+def summarize_arxiv(papers: list[dict], mode="email") -> list[str]:
+    """
+    Return a list of summaries, one per paper.
+    - email : multi-sentence summaries (2-4 sentences)
+    - telegram : ultra-compact 1-line summaries
+    """
+    return summarize_arxiv_many(papers, modes=(mode,))[mode]
+
+
+def summarize_arxiv_many(papers: list[dict], modes=("email", "telegram")) -> dict[str, list[str]]:
+    """
+    Summarize papers for several modes, caching each paper's summary on its
+    own. Only uncached papers are sent, packed into concurrent prompts that
+    fit ARXIV_MAX_INPUT_TOKENS / ARXIV_MAX_OUTPUT_TOKENS; items that come
+    back malformed are retried one paper per prompt. Results keep the
+    order of `papers`.
+    """
+    keys = {
+        (mode, j): _arxiv_cache_prompt(p, mode)
+        for mode in modes
+        for j, p in enumerate(papers)
+    }
+
+    results = {}
+    for k, cache_prompt in keys.items():
+        cached = _cached(ARXIV_MODEL, cache_prompt, ARXIV_TTL, f"arxiv_summary_{k[0]}")
+        if cached is not None:
+            results[k] = cached
+
+    # pack uncached papers into prompts that fit the token budget
+    sizes = [estimate_tokens(_arxiv_block(len(papers), p)) for p in papers]
+    jobs = []
+    for mode in modes:
+        idx = [j for j in range(len(papers)) if (mode, j) not in results]
+        if not idx:
+            continue
+        batches = plan_batches(
+            [sizes[j] for j in idx],
+            overhead=estimate_tokens(_arxiv_prompt([], mode)),
+            max_input_tokens=Config.ARXIV_MAX_INPUT_TOKENS,
+            max_output_tokens=Config.ARXIV_MAX_OUTPUT_TOKENS,
+            output_per_item=ARXIV_OUTPUT_TOKENS.get(mode, 160),
+        )
+        jobs.extend((mode, [idx[b] for b in batch]) for batch in batches)
+    logger.info(
+        "arXiv summaries: %d cached, %d to generate in %d prompt(s)",
+        len(results), len(keys) - len(results), len(jobs),
+    )
+
+    if jobs:
+        fresh = _ask_arxiv(jobs, papers)
+
+        # per-paper retry for anything the batch answer did not cover
+        retry = [(mode, [j]) for mode, idx in jobs for j in idx if (mode, j) not in fresh]
+        if retry:
+            logger.warning("arXiv summaries: retrying %d paper(s) individually", len(retry))
+            fresh.update(_ask_arxiv(retry, papers))
+
+        for k, summary in fresh.items():
+            cache_set(ARXIV_MODEL, keys[k], summary)
+        results.update(fresh)
+
+    out = {}
+    for mode in modes:
+        out[mode] = []
+        for j, p in enumerate(papers):
+            summary = results.get((mode, j))
+            if summary is None:
+                logger.error("arXiv summary failed for %s (%s)", p["id"], mode)
+                # never break the flow: fall back to the abstract itself
+                summary = p["summary"][:300]
+            out[mode].append(summary)
+    return out
+
+
+# -------------------------------------------------------------------------
+# INSPIRE abstract rewrite (hot paper bootstrap)
+# -------------------------------------------------------------------------
+ABSTRACT_MODEL = "gpt-4o"
+ABSTRACT_PROMPT = "inspire_abstract_rewrite"
+ABSTRACT_TTL = 30 * 86400
+ABSTRACT_OUTPUT_TOKENS = 120
+
+
+def _abstract_block(i: int, abstract: str) -> str:
+    return f"[{i}] {abstract}"
+
+
+def _abstract_prompt(abstracts: list[str]) -> str:
+    return PromptManager.format(
+        ABSTRACT_PROMPT,
+        abstracts="\n\n".join(_abstract_block(i, a) for i, a in enumerate(abstracts, start=1)),
+        count=len(abstracts),
+    )
+
+
+def _abstract_cache_prompt(abstract: str) -> str:
+    """Content-addressed cache key: abstract hash + template hash."""
+    content = hashlib.sha256(abstract.encode()).hexdigest()
+    return f"{ABSTRACT_PROMPT}\n{content}\n{PromptManager.hash(ABSTRACT_PROMPT)}"
+
+
+def _ask_abstracts(jobs: list[list[int]], abstracts: list[str]) -> dict[int, str]:
+    # room for the largest batch, so its JSON answer is not truncated
+    max_tokens = min(
+        Config.ABSTRACT_MAX_OUTPUT_TOKENS,
+        max(len(idx) for idx in jobs) * ABSTRACT_OUTPUT_TOKENS,
+    )
+    outs = AI.model(ABSTRACT_MODEL).ask_many(
+        [_abstract_prompt([abstracts[j] for j in idx]) for idx in jobs],
+        name=ABSTRACT_PROMPT,
+        fallback="",
+        max_completion_tokens=max_tokens,
+        response_format={"type": "json_object"},
+    )
+    results = {}
+    for idx, out in zip(jobs, outs):
+        parsed = _parse_indexed(out, len(idx))
+        for i, j in enumerate(idx, start=1):
+            if i in parsed:
+                results[j] = parsed[i]
+    return results
+
+
+def rewrite_abstracts_many(abstracts: list[str]) -> list[str]:
+    """
+    Rewrite abstracts into short digest summaries, many per prompt.
+
+    Each abstract is cached on its own; uncached ones are packed into
+    token-budgeted prompts that run concurrently, malformed items are
+    retried one per prompt, and anything still missing falls back to the
+    original abstract. Empty abstracts stay empty.
+    """
+    results: dict[int, str] = {}
+    todo = []
+    for j, a in enumerate(abstracts):
+        if not a:
+            results[j] = ""
+            continue
+        cached = _cached(ABSTRACT_MODEL, _abstract_cache_prompt(a), ABSTRACT_TTL, ABSTRACT_PROMPT)
+        if cached is not None:
+            results[j] = cached
+        else:
+            todo.append(j)
+
+    if todo:
+        batches = plan_batches(
+            [estimate_tokens(_abstract_block(len(abstracts), abstracts[j])) for j in todo],
+            overhead=estimate_tokens(_abstract_prompt([])),
+            max_input_tokens=Config.ABSTRACT_MAX_INPUT_TOKENS,
+            max_output_tokens=Config.ABSTRACT_MAX_OUTPUT_TOKENS,
+            output_per_item=ABSTRACT_OUTPUT_TOKENS,
+        )
+        jobs = [[todo[b] for b in batch] for batch in batches]
+        logger.info(
+            "Abstract rewrites: %d cached, %d to generate in %d prompt(s)",
+            len(abstracts) - len(todo), len(todo), len(jobs),
+        )
+
+        fresh = _ask_abstracts(jobs, abstracts)
+        retry = [[j] for j in todo if j not in fresh]
+        if retry:
+            logger.warning("Abstract rewrites: retrying %d abstract(s) individually", len(retry))
+            fresh.update(_ask_abstracts(retry, abstracts))
+
+        for j, summary in fresh.items():
+            cache_set(ABSTRACT_MODEL, _abstract_cache_prompt(abstracts[j]), summary)
+        results.update(fresh)
+
+    return [results.get(j, a) for j, a in enumerate(abstracts)]
 
 
 # -------------------------------------------------------------------------
@@ -58,7 +400,19 @@ def summarize_arxiv(papers: list[dict], mode="email") -> list[str]:
 def rewrite_daily_log(text: str, mode="email") -> str:
     prompt_name = f"daily_rewrite_{mode}"
     prompt = PromptManager.format(prompt_name, text=text)
-    return AI.model("gpt-4o").ask(prompt, ttl=80000)  # about 22.5 hours
+    return AI.model("gpt-4o").ask(prompt, ttl=80000, name=prompt_name)  # about 22.5 hours
+
+
+def rewrite_daily_log_stream(text: str, mode="email", timeout: float | None = None):
+    """Like rewrite_daily_log, but yields the rewrite as it is generated."""
+    prompt_name = f"daily_rewrite_{mode}"
+    prompt = PromptManager.format(prompt_name, text=text)
+    return AI.model("gpt-4o").ask_stream(prompt, ttl=80000, timeout=timeout, name=prompt_name)
+
+
+def rewrite_daily_log_many(text: str, modes=CHANNEL_MODES) -> dict[str, str]:
+    """Rewrite the same daily log for several modes in one completion."""
+    return _ask_variants("daily_rewrite", "text", text, modes, model="gpt-4o", ttl=80000)
 
 
 # -------------------------------------------------------------------------
@@ -67,4 +421,4 @@ def rewrite_daily_log(text: str, mode="email") -> str:
 def rewrite_daily_todo(text: str, mode="telegram") -> str:
     prompt_name = f"daily_todo_{mode}"
     prompt = PromptManager.format(prompt_name, text=text)
-    return AI.model("gpt-4o").ask(prompt, ttl=3600)  # 1 hour
+    return AI.model("gpt-4o").ask(prompt, ttl=3600, name=prompt_name)  # 1 hour
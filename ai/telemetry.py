@@ -0,0 +1,174 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from flowc.config import Config
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens (input, output); unknown models are reported without cost
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-5.1": (1.25, 10.00),
+}
+
+_current_run: ContextVar["FlowRun | None"] = ContextVar("flowc_ai_run", default=None)
+_write_lock = threading.Lock()
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float | None:
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    return (input_tokens * prices[0] + output_tokens * prices[1]) / 1_000_000
+
+
+class FlowRun:
+    """Records of every AI call made while one flow runs."""
+
+    def __init__(self, flow: str):
+        self.flow = flow
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.records: list[dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: dict):
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> dict:
+        with self._lock:
+            records = list(self.records)
+        calls = [r for r in records if r["cache"] is None]
+        return {
+            "flow": self.flow,
+            "run_id": self.run_id,
+            "seconds": round(time.time() - self.started, 2),
+            "calls": len(calls),
+            "cache_hits": len(records) - len(calls),
+            "input_tokens": sum(r["input_tokens"] for r in records),
+            "output_tokens": sum(r["output_tokens"] for r in records),
+            "cost_usd": round(sum(r["cost_usd"] or 0.0 for r in records), 6),
+            "failures": sum(1 for r in records if not r["ok"]),
+        }
+
+
+@contextmanager
+def flow_run(flow: str):
+    """
+    Attribute every AI call inside the block to `flow` and log a summary
+    when it ends.
+    """
+    run = FlowRun(flow)
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        s = run.summary()
+        logger.info(
+            "AI usage for %s flow (run %s): %d call(s), %d cache hit(s), "
+            "%d in / %d out tokens, ~$%.4f, %d failure(s)",
+            s["flow"], s["run_id"], s["calls"], s["cache_hits"],
+            s["input_tokens"], s["output_tokens"], s["cost_usd"], s["failures"],
+        )
+
+
+def record_call(
+    *,
+    model: str,
+    prompt_name: str | None,
+    latency: float,
+    attempts: int = 0,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cache: str | None = None,
+    ok: bool = True,
+):
+    """
+    Store one AI call. `cache` is the tier that answered ("memory"/"disk"),
+    or None when the model was called.
+    """
+    run = _current_run.get()
+    record = {
+        "ts": time.time(),
+        "flow": run.flow if run else None,
+        "run_id": run.run_id if run else None,
+        "model": model,
+        "prompt": prompt_name,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "latency_ms": round(latency * 1000, 1),
+        "attempts": attempts,
+        "cache": cache,
+        "cost_usd": estimate_cost(model, input_tokens, output_tokens),
+        "ok": ok,
+    }
+    if run:
+        run.add(record)
+
+    if not Config.AI_METRICS_PATH:
+        return
+    try:
+        path = Path(Config.AI_METRICS_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(record, ensure_ascii=False)
+        with _write_lock:
+            _rotate(path)
+            with path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except OSError as exc:
+        logger.warning("AI telemetry: failed to write metrics: %s", exc)
+
+
+def _backup(path: Path, n: int) -> Path:
+    return path.with_name(f"{path.name}.{n}")
+
+
+def _rotate(path: Path):
+    """Shift path -> .1 -> .2 ... once it passes AI_METRICS_MAX_BYTES."""
+    if not Config.AI_METRICS_MAX_BYTES:
+        return
+    try:
+        if path.stat().st_size < Config.AI_METRICS_MAX_BYTES:
+            return
+    except FileNotFoundError:
+        return
+    backups = Config.AI_METRICS_BACKUPS
+    if backups <= 0:
+        path.unlink(missing_ok=True)
+        return
+    _backup(path, backups).unlink(missing_ok=True)
+    for n in range(backups - 1, 0, -1):
+        if _backup(path, n).exists():
+            _backup(path, n).replace(_backup(path, n + 1))
+    path.replace(_backup(path, 1))
+    logger.info("AI telemetry: rotated %s", path)
+
+
+def load_records(days: float | None = None, path: Path | None = None) -> list[dict]:
+    """Records newer than `days` (all if None), rotated files included, oldest first."""
+    path = Path(path or Config.AI_METRICS_PATH)
+    files = [_backup(path, n) for n in range(Config.AI_METRICS_BACKUPS, 0, -1)] + [path]
+
+    cutoff = time.time() - days * 86400 if days else 0
+    records = []
+    for f in files:
+        if not f.exists():
+            continue
+        with f.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    r = json.loads(line)
+                except ValueError:
+                    continue
+                if r.get("ts", 0) >= cutoff:
+                    records.append(r)
+    return records
@@ -0,0 +1,95 @@
+import argparse
+import logging
+from datetime import datetime
+
+from flowc.ai.cache import CACHE_DIR, get_backend
+
+logger = logging.getLogger(__name__)
+
+
+def _fmt_time(ts: float | None) -> str:
+    if not ts:
+        return "-"
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+
+def _fmt_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+class CacheCLI:
+    def __init__(self):
+        self.cache = get_backend()
+
+    # ------------------------------
+    # stats
+    # ------------------------------
+    def stats(self):
+        s = self.cache.stats()
+
+        print("------ AI Cache Stats ------")
+        print(f"Backend      : {s['backend']}")
+        print(f"Path         : {s['path']}")
+        print(f"Entries      : {s['entries']}")
+        print(f"Size         : {_fmt_bytes(s['bytes'])}")
+        if s["backend"] == "sqlite":
+            print(f"Policy       : {s['policy']}")
+            print(f"Max entries  : {s['max_entries'] or 'unlimited'}")
+            print(f"Max size     : {_fmt_bytes(s['max_bytes']) if s['max_bytes'] else 'unlimited'}")
+            print(f"Oldest entry : {_fmt_time(s['oldest_created_at'])}")
+            print(f"Last hit     : {_fmt_time(s['last_hit_at'])}")
+            for model, m in s["models"].items():
+                print(f"  {model:<14} {m['entries']:>7} entries  {_fmt_bytes(m['bytes'])}")
+        print("----------------------------")
+
+    # ------------------------------
+    # prune
+    # ------------------------------
+    def prune(self, max_age: int | None = None):
+        removed = self.cache.prune(max_age=max_age)
+        print(f"Evicted {removed} cache entr(ies).")
+
+    # ------------------------------
+    # import legacy JSON files
+    # ------------------------------
+    def migrate(self):
+        if not hasattr(self.cache, "import_json"):
+            print("JSON backend in use; nothing to migrate.")
+            return
+        imported = self.cache.import_json(CACHE_DIR)
+        print(f"Imported {imported} JSON cache entr(ies).")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="flowc cache", description="Inspect the AI response cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("stats", help="show cache size and usage")
+
+    prune = sub.add_parser("prune", help="evict entries over the size/entry cap")
+    prune.add_argument(
+        "--max-age-days",
+        type=float,
+        default=None,
+        help="also drop entries created more than this many days ago",
+    )
+
+    sub.add_parser("migrate", help="import legacy .flowc_cache/*.json files")
+
+    args = parser.parse_args(argv)
+    cli = CacheCLI()
+
+    if args.command == "stats":
+        cli.stats()
+    elif args.command == "prune":
+        max_age = int(args.max_age_days * 86400) if args.max_age_days else None
+        cli.prune(max_age=max_age)
+    elif args.command == "migrate":
+        cli.migrate()
+
+
+if __name__ == "__main__":
+    main()
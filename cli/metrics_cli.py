@@ -0,0 +1,103 @@
+import argparse
+import logging
+from collections import defaultdict
+
+from flowc.ai.telemetry import load_records
+
+logger = logging.getLogger(__name__)
+
+
+def _aggregate(records: list[dict]) -> list[dict]:
+    """Group records by (flow, prompt, model)."""
+    groups: dict[tuple, dict] = defaultdict(lambda: {
+        "calls": 0,
+        "cache_hits": 0,
+        "latency_ms": [],
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cost_usd": 0.0,
+        "failures": 0,
+    })
+
+    for r in records:
+        g = groups[(r.get("flow") or "-", r.get("prompt") or "-", r.get("model"))]
+        g["calls"] += 1
+        if r.get("cache"):
+            g["cache_hits"] += 1
+        else:
+            g["latency_ms"].append(r.get("latency_ms", 0.0))
+        g["input_tokens"] += r.get("input_tokens", 0)
+        g["output_tokens"] += r.get("output_tokens", 0)
+        g["cost_usd"] += r.get("cost_usd") or 0.0
+        if not r.get("ok", True):
+            g["failures"] += 1
+
+    rows = []
+    for (flow, prompt, model), g in groups.items():
+        lat = g.pop("latency_ms")
+        rows.append({
+            "flow": flow,
+            "prompt": prompt,
+            "model": model,
+            **g,
+            "avg_ms": sum(lat) / len(lat) if lat else 0.0,
+            "max_ms": max(lat) if lat else 0.0,
+            "hit_rate": g["cache_hits"] / g["calls"] if g["calls"] else 0.0,
+        })
+    return rows
+
+
+def _print_rows(rows: list[dict]):
+    print(f"{'flow':<9} {'prompt':<26} {'model':<9} {'calls':>5} {'hit%':>5} "
+          f"{'avg s':>6} {'max s':>6} {'in tok':>8} {'out tok':>8} {'cost $':>8}")
+    for r in rows:
+        print(
+            f"{r['flow']:<9} {r['prompt'][:26]:<26} {str(r['model'])[:9]:<9} "
+            f"{r['calls']:>5} {r['hit_rate'] * 100:>4.0f}% "
+            f"{r['avg_ms'] / 1000:>6.1f} {r['max_ms'] / 1000:>6.1f} "
+            f"{r['input_tokens']:>8} {r['output_tokens']:>8} {r['cost_usd']:>8.4f}"
+        )
+
+
+class MetricsCLI:
+    # ------------------------------
+    # slowest / most expensive prompts
+    # ------------------------------
+    def report(self, days: float = 7, top: int = 10):
+        records = load_records(days=days)
+        if not records:
+            print(f"No AI metrics recorded in the last {days:g} day(s).")
+            return
+
+        rows = _aggregate(records)
+
+        print(f"------ AI Metrics (last {days:g} day(s), {len(records)} calls) ------")
+        print("\nSlowest prompts (avg latency of model calls):")
+        _print_rows(sorted(rows, key=lambda r: r["avg_ms"], reverse=True)[:top])
+
+        print("\nMost expensive prompts (total estimated cost):")
+        _print_rows(sorted(rows, key=lambda r: r["cost_usd"], reverse=True)[:top])
+
+        print("\nPer flow:")
+        flows: dict[str, dict] = defaultdict(lambda: {"runs": set(), "calls": 0, "cost": 0.0})
+        for r in records:
+            f = flows[r.get("flow") or "-"]
+            f["runs"].add(r.get("run_id"))
+            f["calls"] += 1
+            f["cost"] += r.get("cost_usd") or 0.0
+        for name, f in sorted(flows.items()):
+            print(f"  {name:<9} runs={len(f['runs']):<4} calls={f['calls']:<6} cost=${f['cost']:.4f}")
+        print("---------------------------------------------------")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="flowc metrics", description="Report AI call telemetry.")
+    parser.add_argument("--days", type=float, default=7, help="look back this many days")
+    parser.add_argument("--top", type=int, default=10, help="rows per table")
+    args = parser.parse_args(argv)
+
+    MetricsCLI().report(days=args.days, top=args.top)
+
+
+if __name__ == "__main__":
+    main()
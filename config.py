@@ -18,6 +18,77 @@ def _resolve_path(value: str | None, default: Path) -> Path:
 
 class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    AI_MAX_WORKERS = int(os.getenv("AI_MAX_WORKERS", "4"))
+    OPENAI_POOL_SIZE = int(os.getenv("OPENAI_POOL_SIZE", "8"))
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
+    AI_STREAM_STALL_TIMEOUT = float(os.getenv("AI_STREAM_STALL_TIMEOUT", "30"))
+
+    # shared HTTP transport for the connectors (arXiv, INSPIRE, Notion, Telegram);
+    # per-host timeouts via HTTP_TIMEOUTS="api.notion.com=15,export.arxiv.org=30"
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+    HTTP_TIMEOUTS = os.getenv("HTTP_TIMEOUTS", "")
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+    HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "1.0"))  # seconds, doubled per attempt
+
+    # OpenAI rate limits: defaults per model, overridable per model with
+    # AI_RATE_LIMITS="gpt-4o=500:30000,gpt-5.1=500:30000" (rpm:tpm)
+    AI_RPM = int(os.getenv("AI_RPM", "500"))
+    AI_TPM = int(os.getenv("AI_TPM", "30000"))
+    AI_RATE_LIMITS = os.getenv("AI_RATE_LIMITS", "")
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+
+    # seconds between prompt file mtime checks (0: never reload)
+    PROMPT_RELOAD_INTERVAL = float(os.getenv("PROMPT_RELOAD_INTERVAL", "5"))
+
+    # per-call AI metrics (JSONL), see cli/metrics_cli.py
+    AI_METRICS_PATH = _resolve_path(
+        os.getenv("AI_METRICS_PATH"), ROOT_DIR / ".." / "logs" / "ai_metrics.jsonl"
+    )
+    # rotated to ai_metrics.jsonl.1 .. .N past this size; 0: never rotate
+    AI_METRICS_MAX_BYTES = int(os.getenv("AI_METRICS_MAX_BYTES", str(10 * 1024 * 1024)))
+    AI_METRICS_BACKUPS = int(os.getenv("AI_METRICS_BACKUPS", "3"))
+
+    # arXiv candidate selection: local relevance ranking, LLM keywords optional
+    ARXIV_LLM_KEYWORDS = os.getenv("ARXIV_LLM_KEYWORDS", "0").lower() in ("1", "true", "yes")
+    ARXIV_MIN_RELEVANCE = float(os.getenv("ARXIV_MIN_RELEVANCE", "0.2"))
+    ARXIV_MAX_PAPERS = int(os.getenv("ARXIV_MAX_PAPERS", "20"))  # 0: no cap
+    ARXIV_DUPLICATE_THRESHOLD = float(os.getenv("ARXIV_DUPLICATE_THRESHOLD", "0.8"))  # MinHash Jaccard
+
+    # incremental arXiv ingestion: paged fetch back to the stored watermark
+    ARXIV_PAGE_SIZE = int(os.getenv("ARXIV_PAGE_SIZE", "100"))
+    ARXIV_MAX_PAGES = int(os.getenv("ARXIV_MAX_PAGES", "10"))
+    ARXIV_LOOKBACK_DAYS = int(os.getenv("ARXIV_LOOKBACK_DAYS", "3"))  # first run / stale watermark
+    ARXIV_REQUEST_INTERVAL = float(os.getenv("ARXIV_REQUEST_INTERVAL", "3"))  # seconds between requests
+
+    # INSPIRE-HEP: polite page concurrency and an on-disk response cache
+    INSPIRE_MAX_CONCURRENCY = int(os.getenv("INSPIRE_MAX_CONCURRENCY", "3"))
+    INSPIRE_CACHE_DIR = _resolve_path(
+        os.getenv("INSPIRE_CACHE_DIR"), ROOT_DIR / ".." / ".flowc_cache" / "inspire"
+    )
+    INSPIRE_CACHE_TTL = int(os.getenv("INSPIRE_CACHE_TTL", str(7 * 86400)))  # 0: no cache
+
+    # DawnFlow hot paper pick: citation/diversity-weighted instead of uniform
+    HOTPAPER_WEIGHTED = os.getenv("HOTPAPER_WEIGHTED", "0").lower() in ("1", "true", "yes")
+
+    # per-prompt token budget when batching arXiv papers
+    ARXIV_MAX_INPUT_TOKENS = int(os.getenv("ARXIV_MAX_INPUT_TOKENS", "12000"))
+    ARXIV_MAX_OUTPUT_TOKENS = int(os.getenv("ARXIV_MAX_OUTPUT_TOKENS", "4000"))
+    # same for INSPIRE abstract rewrites in the hot paper bootstrap
+    ABSTRACT_MAX_INPUT_TOKENS = int(os.getenv("ABSTRACT_MAX_INPUT_TOKENS", "12000"))
+    ABSTRACT_MAX_OUTPUT_TOKENS = int(os.getenv("ABSTRACT_MAX_OUTPUT_TOKENS", "4000"))
+
+    # AI response cache: "sqlite" (default) or legacy "json" files
+    AI_CACHE_BACKEND = os.getenv("AI_CACHE_BACKEND", "sqlite")
+    AI_CACHE_PATH = _resolve_path(
+        os.getenv("AI_CACHE_PATH"), ROOT_DIR / ".." / ".flowc_cache" / "ai_cache.sqlite3"
+    )
+    AI_CACHE_MAX_BYTES = int(os.getenv("AI_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "0"))  # 0: no limit
+    AI_CACHE_POLICY = os.getenv("AI_CACHE_POLICY", "lru")  # lru | ttl
+    AI_CACHE_MAX_AGE = int(os.getenv("AI_CACHE_MAX_AGE", str(30 * 86400)))
+    AI_MEMORY_CACHE_ENTRIES = int(os.getenv("AI_MEMORY_CACHE_ENTRIES", "256"))  # 0: disabled
+    AI_MEMORY_CACHE_BYTES = int(os.getenv("AI_MEMORY_CACHE_BYTES", str(16 * 1024 * 1024)))
 
     NOTION_TOKEN = os.getenv("NOTION_TOKEN")
     NOTION_DAILY_DB = os.getenv("NOTION_DAILY_DB")
@@ -35,3 +106,10 @@ class Config:
     FLOWC_ROOT = ROOT_DIR
     GIT_REPO_PATH = os.getenv("GIT_REPO_PATH")
     SQLITE_PATH = os.getenv("SQLITE_PATH")
+    # shared connections (connectors/sqlite.py): WAL + synchronous=NORMAL
+    SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # ms to wait on a locked db
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # 0: no mmap
+    SQLITE_CACHED_STATEMENTS = int(os.getenv("SQLITE_CACHED_STATEMENTS", "256"))
+    # in-memory Bloom filter of archived paper ids (skips SQLite for new ids)
+    PAPER_BLOOM_CAPACITY = int(os.getenv("PAPER_BLOOM_CAPACITY", "100000"))
+    PAPER_BLOOM_ERROR_RATE = float(os.getenv("PAPER_BLOOM_ERROR_RATE", "0.01"))
@@ -1,32 +1,101 @@
 import logging
-import time
-from datetime import datetime, timedelta
+import re
+from urllib.parse import urlsplit
 
-import requests
+from flowc.config import Config
+from flowc.connectors.http import AsyncHttpTransport, HttpTransport, get_async_transport, get_transport
 
 
 logger = logging.getLogger(__name__)
 
+_VERSION_RE = re.compile(r"v\d+$")
+
+
+def normalize_arxiv_id(raw: str) -> str:
+    """
+    'http://arxiv.org/abs/2401.01234v2' -> '2401.01234'
+    'hep-ph/0601001v1'                  -> 'hep-ph/0601001'
+    """
+    pid = raw.strip()
+    for prefix in ("http://arxiv.org/abs/", "https://arxiv.org/abs/", "arXiv:", "arxiv:"):
+        if pid.startswith(prefix):
+            pid = pid[len(prefix):]
+            break
+    return _VERSION_RE.sub("", pid)
+
 class ArxivAPI:
     BASE_URL = "https://export.arxiv.org/api/query"
+    SEARCH_QUERY = "(cat:hep-ex OR cat:hep-ph)"
+
+    def __init__(self, transport: HttpTransport | None = None):
+        self.http = transport or get_transport()
+        # arXiv asks API clients for one request every ~3 seconds
+        self.http.set_min_interval(urlsplit(self.BASE_URL).hostname, Config.ARXIV_REQUEST_INTERVAL)
+
+    def fetch(self, max_results=50, start=0, sort_by="submittedDate") -> str:
+        params = {
+            "search_query": self.SEARCH_QUERY,
+            "start": start,
+            "max_results": max_results,
+            "sortBy": sort_by,
+            "sortOrder": "descending",
+        }
+
+        logger.info("arXiv fetch (start=%d, max_results=%d)", start, max_results)
+        try:
+            return self.http.get(self.BASE_URL, params=params, label="arXiv").text
+        except Exception as e:
+            logger.warning("arXiv fetch failed: %s", e)
+            return ""
+
+    def fetch_pages(self, page_size: int | None = None, max_pages: int | None = None):
+        """
+        Yield raw Atom pages newest-update first (sortBy=lastUpdatedDate).
+        The caller stops iterating once it reaches entries it has seen.
+        A failed request yields "" and ends the iteration, so callers can
+        tell it from a short last page.
+        """
+        page_size = page_size or Config.ARXIV_PAGE_SIZE
+        max_pages = max_pages or Config.ARXIV_MAX_PAGES
+        for page in range(max_pages):
+            raw = self.fetch(max_results=page_size, start=page * page_size, sort_by="lastUpdatedDate")
+            yield raw
+            if not raw:
+                return
+
 
-    def fetch(self, max_results=50) -> str:
+class AsyncArxivAPI:
+    """asyncio variant of ArxivAPI with the same parameters and fallbacks."""
+
+    BASE_URL = ArxivAPI.BASE_URL
+    SEARCH_QUERY = ArxivAPI.SEARCH_QUERY
+
+    def __init__(self, transport: AsyncHttpTransport | None = None):
+        self.http = transport or get_async_transport()
+        self.http.set_min_interval(urlsplit(self.BASE_URL).hostname, Config.ARXIV_REQUEST_INTERVAL)
+
+    async def fetch(self, max_results=50, start=0, sort_by="submittedDate") -> str:
         params = {
-            "search_query": "(cat:hep-ex OR cat:hep-ph)",
-            "start": 0,
+            "search_query": self.SEARCH_QUERY,
+            "start": start,
             "max_results": max_results,
-            "sortBy": "submittedDate",
+            "sortBy": sort_by,
             "sortOrder": "descending",
         }
 
-        for attempt in range(1, 4):
-            try:
-                logger.info("arXiv fetch attempt %d", attempt)
-                resp = requests.get(self.BASE_URL, params=params, timeout=10)
-                resp.raise_for_status()
-                return resp.text
-            except Exception as e:
-                logger.warning("arXiv attempt %d failed: %s", attempt, e)
-                time.sleep(attempt)
-
-        return ""
+        logger.info("arXiv fetch (start=%d, max_results=%d)", start, max_results)
+        try:
+            resp = await self.http.get(self.BASE_URL, params=params, label="arXiv")
+            return resp.text
+        except Exception as e:
+            logger.warning("arXiv fetch failed: %s", e)
+            return ""
+
+    async def fetch_pages(self, page_size: int | None = None, max_pages: int | None = None):
+        page_size = page_size or Config.ARXIV_PAGE_SIZE
+        max_pages = max_pages or Config.ARXIV_MAX_PAGES
+        for page in range(max_pages):
+            raw = await self.fetch(max_results=page_size, start=page * page_size, sort_by="lastUpdatedDate")
+            yield raw
+            if not raw:
+                return
@@ -1,48 +1,249 @@
 import logging
 import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 from flowc.config import Config
+from flowc.connectors.sqlite import close_connection, get_connection
+from flowc.utils import minhash
+from flowc.utils.bloom import BloomFilter
 
 logger = logging.getLogger(__name__)
 
+_CHUNK = 500  # bound parameters per IN (...) query
+
+# one filter per database file, shared by every PaperDatabase in the process
+_blooms: dict[Path, BloomFilter] = {}
+_bloom_lock = threading.Lock()
+
 
 class PaperDatabase:
     def __init__(self, path: str | None = None):
         self.path = Path(path or Config.SQLITE_PATH)
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.path)
-        self.conn.row_factory = sqlite3.Row  # dict-like rows
-        self._init_table()
+        get_connection(self.path)  # open + migrate eagerly
 
-    def _init_table(self):
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's shared connection (see connectors.sqlite)."""
+        return get_connection(self.path)
+
+    # ----------------------------------------------------------------------
+    #  existence checks (Bloom filter in front of SQLite)
+    # ----------------------------------------------------------------------
+    @property
+    def bloom(self) -> BloomFilter:
+        """
+        Bloom filter of every archived id, loaded on first use, for the
+        read-side checks (paper_exists, existing_ids): a hit is confirmed
+        in SQLite, a miss is trusted. Rows written by other processes
+        after the load are not in the filter, so those two can return
+        false negatives for them; writes always check SQLite itself.
+        """
+        key = self.path.resolve()
+        with _bloom_lock:
+            bloom = _blooms.get(key)
+            if bloom is None or bloom.saturated:
+                bloom = _blooms[key] = self._load_bloom()
+            return bloom
+
+    def _load_bloom(self) -> BloomFilter:
         cur = self.conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS papers (
-                id TEXT PRIMARY KEY,
-                title TEXT,
-                summary TEXT,
-                created_at TEXT
-            )
-            """
-        )
-        self.conn.commit()
+        cur.execute("SELECT COUNT(*) FROM papers")
+        n = cur.fetchone()[0]
+        # headroom so a run of new saves does not force a reload
+        bloom = BloomFilter(max(Config.PAPER_BLOOM_CAPACITY, 2 * n), Config.PAPER_BLOOM_ERROR_RATE)
+        bloom.update(r[0] for r in cur.execute("SELECT id FROM papers"))
+        logger.info("Loaded %d archived id(s) into Bloom filter (%d KiB)", n, bloom.nbytes // 1024)
+        return bloom
+
+    def _remember(self, ids):
+        bloom = self.bloom
+        with _bloom_lock:
+            bloom.update(ids)
 
     def paper_exists(self, paper_id: str) -> bool:
+        if paper_id not in self.bloom:
+            return False
         cur = self.conn.cursor()
         cur.execute("SELECT 1 FROM papers WHERE id = ?", (paper_id,))
         return cur.fetchone() is not None
 
-    def save_paper(self, paper_id: str, title: str, summary: str):
+    def existing_ids(self, ids) -> set[str]:
+        """The subset of `ids` already archived, in one pass."""
+        bloom = self.bloom
+        candidates = [i for i in dict.fromkeys(ids) if i in bloom]
+        if not candidates:
+            return set()
+        return self._existing_ids(self.conn.cursor(), candidates)
+
+    def save_paper(self, paper_id: str, title: str, summary: str, signature=None):
         cur = self.conn.cursor()
         cur.execute(
             "INSERT OR REPLACE INTO papers (id, title, summary, created_at) VALUES (?, ?, ?, ?)",
             (paper_id, title, summary, datetime.utcnow().isoformat()),
         )
+        if signature is not None:
+            self._save_signature(cur, paper_id, signature)
         self.conn.commit()
+        self._remember([paper_id])
         logger.info("Saved paper %s to SQLite archive", paper_id)
 
+    def save_papers(self, papers: list[dict]) -> tuple[int, int]:
+        """
+        Archive many papers ({"id", "title", "summary", optional
+        "signature"}) in one transaction. Ids already archived are left
+        untouched. Returns (inserted, skipped).
+        """
+        if not papers:
+            return 0, 0
+        now = datetime.utcnow().isoformat()
+        with self.conn:
+            cur = self.conn.cursor()
+            # write lock first: no other writer can add an id between
+            # the check and the insert (the Bloom filter may be stale).
+            # An open implicit transaction has written, so already holds it.
+            if not self.conn.in_transaction:
+                cur.execute("BEGIN IMMEDIATE")
+            existing = self._existing_ids(cur, [p["id"] for p in papers])
+            new, seen = [], set(existing)
+            for p in papers:
+                if p["id"] not in seen:
+                    seen.add(p["id"])
+                    new.append(p)
+
+            cur.executemany(
+                "INSERT INTO papers (id, title, summary, created_at) VALUES (?, ?, ?, ?)",
+                [(p["id"], p["title"], p["summary"], now) for p in new],
+            )
+            for p in new:
+                if p.get("signature") is not None:
+                    self._save_signature(cur, p["id"], p["signature"])
+        self._remember(p["id"] for p in new)
+
+        logger.info("Saved %d paper(s) to SQLite archive (%d already present)", len(new), len(papers) - len(new))
+        return len(new), len(papers) - len(new)
+
+    def _existing_ids(self, cur, ids: list[str]) -> set[str]:
+        found = set()
+        for i in range(0, len(ids), _CHUNK):
+            chunk = ids[i:i + _CHUNK]
+            cur.execute(f"SELECT id FROM papers WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            found.update(r["id"] for r in cur.fetchall())
+        return found
+
+    # ----------------------------------------------------------------------
+    #  ingestion watermark
+    # ----------------------------------------------------------------------
+    def get_watermark(self, source: str) -> tuple[datetime, str] | None:
+        cur = self.conn.cursor()
+        cur.execute("SELECT updated, last_id FROM ingest_state WHERE source = ?", (source,))
+        row = cur.fetchone()
+        if row is None:
+            return None
+        return datetime.fromisoformat(row["updated"]), row["last_id"]
+
+    def set_watermark(self, source: str, updated: datetime, last_id: str):
+        cur = self.conn.cursor()
+        cur.execute(
+            "INSERT OR REPLACE INTO ingest_state (source, updated, last_id) VALUES (?, ?, ?)",
+            (source, updated.isoformat(), last_id),
+        )
+        self.conn.commit()
+        logger.info("Watermark for %s advanced to %s (%s)", source, updated.isoformat(), last_id)
+
+    # ----------------------------------------------------------------------
+    #  near-duplicate detection (MinHash / LSH)
+    # ----------------------------------------------------------------------
+    def _save_signature(self, cur, paper_id: str, signature):
+        cur.execute(
+            "INSERT OR REPLACE INTO paper_signatures (id, signature) VALUES (?, ?)",
+            (paper_id, minhash.to_bytes(signature)),
+        )
+        cur.execute("DELETE FROM paper_lsh WHERE id = ?", (paper_id,))
+        cur.executemany(
+            "INSERT OR IGNORE INTO paper_lsh (band, bucket, id) VALUES (?, ?, ?)",
+            [(band, h, paper_id) for band, h in enumerate(minhash.band_hashes(signature))],
+        )
+
+    def find_near_duplicates(self, signature, threshold: float = 0.8) -> list[tuple[str, float]]:
+        """
+        Stored papers whose estimated Jaccard similarity to `signature` is
+        at least `threshold`, best first. Only papers sharing an LSH bucket
+        are compared, via the (band, bucket) primary key.
+        """
+        pairs = list(enumerate(minhash.band_hashes(signature)))
+        cur = self.conn.cursor()
+        cur.execute(
+            f"""
+            SELECT s.id, s.signature
+            FROM paper_signatures s
+            WHERE s.id IN (
+                SELECT id FROM paper_lsh
+                WHERE (band, bucket) IN (VALUES {", ".join("(?, ?)" for _ in pairs)})
+            )
+            """,
+            [v for pair in pairs for v in pair],
+        )
+        hits = []
+        for row in cur.fetchall():
+            sim = minhash.similarity(signature, minhash.from_bytes(row["signature"]))
+            if sim >= threshold:
+                hits.append((row["id"], sim))
+        return sorted(hits, key=lambda h: -h[1])
+
+    # ----------------------------------------------------------------------
+    #  fetch every archived paper
+    # ----------------------------------------------------------------------
+    def fetch_all(self) -> list[dict]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT id, title, summary, created_at FROM papers")
+        return [dict(row) for row in cur.fetchall()]
+
+    def fetch_since(self, rowid: int) -> list[dict]:
+        """Papers stored after `rowid` (insertion order), with their rowid."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT rowid, title, summary FROM papers WHERE rowid > ? ORDER BY rowid", (rowid,))
+        return [dict(row) for row in cur.fetchall()]
+
+    # ----------------------------------------------------------------------
+    #  relevance ranker counts
+    # ----------------------------------------------------------------------
+    def load_ranker_state(self) -> tuple[list[tuple[str, int, float]], int, int]:
+        """([(term, df, tf)], n_docs, last_rowid) as last saved."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT name, value FROM ranker_state")
+        state = {r["name"]: r["value"] for r in cur.fetchall()}
+        cur.execute("SELECT term, df, tf FROM ranker_terms")
+        terms = [tuple(r) for r in cur.fetchall()]
+        return terms, state.get("n_docs", 0), state.get("last_rowid", 0)
+
+    def save_ranker_state(
+        self, deltas: list[tuple[str, int, float]], n_docs: int, last_rowid: int, since: int
+    ) -> bool:
+        """
+        Add (term, df, tf) deltas for the papers after rowid `since` and
+        record them as folded in. Returns False (nothing written) when
+        another process already advanced past `since`.
+        """
+        with self.conn:
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute("SELECT value FROM ranker_state WHERE name = 'last_rowid'").fetchone()
+            if (row["value"] if row else 0) != since:
+                return False
+            self.conn.executemany(
+                """
+                INSERT INTO ranker_terms (term, df, tf) VALUES (?, ?, ?)
+                ON CONFLICT(term) DO UPDATE SET df = df + excluded.df, tf = tf + excluded.tf
+                """,
+                deltas,
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ranker_state (name, value) VALUES (?, ?)",
+                [("n_docs", n_docs), ("last_rowid", last_rowid)],
+            )
+        return True
+
     # ----------------------------------------------------------------------
     #  fetch last N papers
     # ----------------------------------------------------------------------
@@ -79,5 +280,5 @@ class PaperDatabase:
         return [dict(row) for row in rows]
 
     def close(self):
-        self.conn.close()
+        close_connection(self.path)
         logger.info("Closed SQLite connection to %s", self.path)
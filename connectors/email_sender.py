@@ -1,3 +1,4 @@
+import asyncio
 import smtplib
 import time
 import logging
@@ -52,3 +53,13 @@ class EmailSender:
             return False
 
         raise last_error
+
+
+class AsyncEmailSender(EmailSender):
+    """
+    asyncio variant of EmailSender. smtplib has no async API, so the
+    blocking send (retries included) runs in a worker thread.
+    """
+
+    async def send(self, html: str, subject: str = "[FlowC] Daily Report", **kwargs):
+        return await asyncio.to_thread(EmailSender.send, self, html, subject, **kwargs)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import subprocess
 from pathlib import Path
@@ -10,13 +11,16 @@ class GitConnector:
     def __init__(self, repo_path: str | None = None):
         self.repo_path = Path(repo_path or Config.GIT_REPO_PATH)
 
-    def get_commit_log(self, days: int = 1) -> str:
-        cmd = [
+    def _log_cmd(self, days: int) -> list[str]:
+        return [
             "git", "-C", str(self.repo_path),
             "log", f"--since={days}.days",
             "--pretty=format:%h %ad %s",
             "--date=short"
         ]
+
+    def get_commit_log(self, days: int = 1) -> str:
+        cmd = self._log_cmd(days)
         try:
             logger.info("Running git log for last %s day(s)", days)
             out = subprocess.check_output(cmd, text=True)
@@ -36,3 +40,33 @@ class GitConnector:
         except subprocess.CalledProcessError as e:
             logger.warning("Git pull failed: %s", e.output)
             return False
+
+
+class AsyncGitConnector(GitConnector):
+    """asyncio variant of GitConnector (git runs as an async subprocess)."""
+
+    async def _run(self, cmd: list[str], stderr=asyncio.subprocess.PIPE) -> tuple[int, str]:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=stderr
+        )
+        out, _ = await proc.communicate()
+        return proc.returncode, out.decode()
+
+    async def get_commit_log(self, days: int = 1) -> str:
+        logger.info("Running git log for last %s day(s)", days)
+        code, out = await self._run(self._log_cmd(days))
+        if code != 0:
+            logger.warning("git log failed for repo %s", self.repo_path)
+            return ""
+        return out.strip()
+
+    async def pull(self) -> bool:
+        """Run git pull in the repo. Return True if success."""
+        cmd = ["git", "-C", str(self.repo_path), "pull", "--ff-only"]
+        logger.info("Running git pull in %s", self.repo_path)
+        code, out = await self._run(cmd, stderr=asyncio.subprocess.STDOUT)
+        if code != 0:
+            logger.warning("Git pull failed: %s", out)
+            return False
+        logger.info("git pull successful")
+        return True
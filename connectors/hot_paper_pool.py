@@ -1,11 +1,19 @@
 import logging
+import math
+import random
 import sqlite3
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from flowc.config import Config
+from flowc.connectors.sqlite import close_connection, get_connection
 
 logger = logging.getLogger(__name__)
 
+_CHUNK = 500  # bound parameters per IN (...) query
+_MAX_DRAWS = 16  # random probes before falling back / rebuilding
+_PICK_COLUMNS = "id, title, summary, year, arxiv, collaboration"
+
 
 class HotPaperPool:
     """
@@ -15,33 +23,11 @@ class HotPaperPool:
 
     def __init__(self, path: str | None = None):
         self.path = Path(path or Config.SQLITE_PATH)
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.path)
-        self.conn.row_factory = sqlite3.Row
-        self._init_table()
+        get_connection(self.path)  # open + migrate eagerly
 
-    def _init_table(self):
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS hot_paper_pool (
-                id TEXT PRIMARY KEY,        -- internal key (usually arxiv or synthetic)
-                title TEXT NOT NULL,
-                summary TEXT,
-                year INTEGER,
-                arxiv TEXT,                 -- raw arxiv ID as string (may be None)
-                created_at TEXT,
-                used INTEGER DEFAULT 0      -- 0: not used, 1: already consumed
-            )
-            """
-        )
-        cur.execute(
-            """
-            CREATE UNIQUE INDEX IF NOT EXISTS idx_hot_paper_title_year
-            ON hot_paper_pool(title, year)
-            """
-        )
-        self.conn.commit()
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return get_connection(self.path)
 
     def add_paper(self, pid: str, title: str, summary: str, year: int | None, arxiv: str | None):
         """
@@ -57,34 +43,239 @@ class HotPaperPool:
                 """,
                 (pid, title, summary, year, arxiv, datetime.utcnow().isoformat()),
             )
+            self._invalidate_selection(cur)
             self.conn.commit()
         except Exception as exc:
             logger.error("HotPaperPool: failed to insert %s: %s", pid, exc)
 
-    def get_one_unused(self) -> dict | None:
+    def add_papers(self, papers: list[dict]) -> tuple[int, int]:
+        """
+        Insert many papers ({"id", "title", "summary", "year", "arxiv",
+        optional "citations" and "collaboration"})
+        with one executemany in a single transaction. Papers whose id or
+        (title, year) is already pooled are skipped. Returns (inserted, skipped);
+        a failed insert is rolled back and raises sqlite3.Error.
+        """
+        if not papers:
+            return 0, 0
+        now = datetime.utcnow().isoformat()
+        try:
+            with self.conn:
+                before = self.conn.total_changes
+                self.conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO hot_paper_pool
+                    (id, title, summary, year, arxiv, citations, collaboration, created_at, used)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+                    """,
+                    [
+                        (p["id"], p["title"], p["summary"], p.get("year"), p.get("arxiv"),
+                         p.get("citations"), p.get("collaboration"), now)
+                        for p in papers
+                    ],
+                )
+                inserted = self.conn.total_changes - before
+                if inserted:
+                    self._invalidate_selection(self.conn.cursor())
+        except sqlite3.Error as exc:
+            # rolled back; re-raised so callers do not checkpoint lost papers
+            logger.error("HotPaperPool: bulk insert of %d paper(s) failed: %s", len(papers), exc)
+            raise
+        return inserted, len(papers) - inserted
+
+    def find_existing(
+        self, ids: list[str], title_years: list[tuple[str, int | None]]
+    ) -> tuple[set[str], set[tuple[str, int | None]]]:
+        """
+        Which of `ids` and which (title, year) pairs are already pooled,
+        in a few chunked IN queries instead of one lookup per paper.
+        """
+        cur = self.conn.cursor()
+        found_ids: set[str] = set()
+        for i in range(0, len(ids), _CHUNK):
+            chunk = ids[i:i + _CHUNK]
+            cur.execute(
+                f"SELECT id FROM hot_paper_pool WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            found_ids.update(r["id"] for r in cur.fetchall())
+
+        wanted = set(title_years)
+        titles = sorted({t for t, _ in wanted})
+        found_pairs: set[tuple[str, int | None]] = set()
+        for i in range(0, len(titles), _CHUNK):
+            chunk = titles[i:i + _CHUNK]
+            cur.execute(
+                f"SELECT title, year FROM hot_paper_pool WHERE title IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            found_pairs.update((r["title"], r["year"]) for r in cur.fetchall() if (r["title"], r["year"]) in wanted)
+        return found_ids, found_pairs
+
+    # ----------------------------------------------------------
+    # bootstrap checkpoints
+    # ----------------------------------------------------------
+    def done_pages(self, query: str) -> set[int]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT page FROM bootstrap_progress WHERE query = ?", (query,))
+        return {r["page"] for r in cur.fetchall()}
+
+    def mark_page_done(self, query: str, page: int, added: int):
+        cur = self.conn.cursor()
+        cur.execute(
+            "INSERT OR REPLACE INTO bootstrap_progress (query, page, added, done_at) VALUES (?, ?, ?, ?)",
+            (query, page, added, datetime.utcnow().isoformat()),
+        )
+        self.conn.commit()
+
+    def reset_progress(self, query: str | None = None):
+        cur = self.conn.cursor()
+        if query is None:
+            cur.execute("DELETE FROM bootstrap_progress")
+        else:
+            cur.execute("DELETE FROM bootstrap_progress WHERE query = ?", (query,))
+        self.conn.commit()
+
+    def get_one_unused(self, weighted: bool = False) -> dict | None:
+        """
+        Get ONE unused paper at random, without sorting the pool.
+
+        Uniform: probe random rowids through the partial index on unused
+        rows. weighted=True: draw from the precomputed selection table
+        (see rebuild_selection), avoiding the previous pick's collaboration.
+        """
+        if weighted:
+            paper = self._pick_weighted()
+            if paper is not None:
+                return paper
+        return self._pick_uniform()
+
+    def _pick_uniform(self) -> dict | None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT rowid FROM hot_paper_pool INDEXED BY idx_hot_paper_unused WHERE used = 0 ORDER BY rowid LIMIT 1"
+        )
+        lo = cur.fetchone()
+        if lo is None:
+            return None
+        cur.execute(
+            "SELECT rowid FROM hot_paper_pool INDEXED BY idx_hot_paper_unused WHERE used = 0 ORDER BY rowid DESC LIMIT 1"
+        )
+        lo, hi = lo[0], cur.fetchone()[0]
+
+        # rejection sampling over [lo, hi] keeps the draw uniform despite gaps
+        for _ in range(_MAX_DRAWS):
+            cur.execute(
+                f"SELECT {_PICK_COLUMNS} FROM hot_paper_pool WHERE rowid = ? AND used = 0",
+                (random.randint(lo, hi),),
+            )
+            row = cur.fetchone()
+            if row:
+                return dict(row)
+
+        # sparse pool: next unused row after a random point (slightly gap-biased)
+        cur.execute(
+            f"""
+            SELECT {_PICK_COLUMNS} FROM hot_paper_pool INDEXED BY idx_hot_paper_unused
+            WHERE used = 0 AND rowid >= ? ORDER BY rowid LIMIT 1
+            """,
+            (random.randint(lo, hi),),
+        )
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+    # ----------------------------------------------------------
+    # weighted selection
+    # ----------------------------------------------------------
+    @staticmethod
+    def _invalidate_selection(cur):
+        cur.execute("DELETE FROM hot_paper_selection")
+
+    def rebuild_selection(self) -> int:
         """
-        Get ONE unused paper (random).
+        Precompute selection weights for every unused paper:
+
+            (1 + log1p(citations)) / sqrt(papers in same decade)
+                                   / sqrt(papers of same collaboration)
+
+        so highly cited papers are favoured while crowded decades and
+        collaborations are damped. Returns the number of rows written.
         """
+        cur = self.conn.cursor()
+        cur.execute("SELECT id, year, citations, collaboration FROM hot_paper_pool WHERE used = 0 ORDER BY rowid")
+        rows = cur.fetchall()
+
+        decades = Counter((r["year"] or 0) // 10 for r in rows)
+        collabs = Counter(r["collaboration"] or "" for r in rows)
+
+        entries, total = [], 0.0
+        for r in rows:
+            weight = (1.0 + math.log1p(r["citations"] or 0)) / math.sqrt(
+                decades[(r["year"] or 0) // 10] * collabs[r["collaboration"] or ""]
+            )
+            entries.append((total + weight, total, r["id"]))
+            total += weight
+
+        with self.conn:
+            self._invalidate_selection(cur)
+            cur.executemany("INSERT INTO hot_paper_selection (hi, lo, id) VALUES (?, ?, ?)", entries)
+        logger.info("HotPaperPool: rebuilt weighted selection over %d paper(s)", len(entries))
+        return len(entries)
+
+    def _last_collaboration(self) -> str | None:
         cur = self.conn.cursor()
         cur.execute(
             """
-            SELECT id, title, summary, year, arxiv
-            FROM hot_paper_pool
-            WHERE used = 0
-            ORDER BY RANDOM()
-            LIMIT 1
+            SELECT collaboration FROM hot_paper_pool INDEXED BY idx_hot_paper_used_at
+            WHERE used = 1 AND used_at IS NOT NULL ORDER BY used_at DESC LIMIT 1
             """
         )
         row = cur.fetchone()
-        return dict(row) if row else None
+        return row["collaboration"] if row else None
+
+    def _pick_weighted(self) -> dict | None:
+        cur = self.conn.cursor()
+        last = self._last_collaboration()
+
+        for attempt in range(2):
+            cur.execute("SELECT MAX(hi) FROM hot_paper_selection")
+            total = cur.fetchone()[0]
+            if total is None or attempt:
+                # empty/stale table (new papers, too many used gaps): rebuild
+                if not self.rebuild_selection():
+                    return None
+                cur.execute("SELECT MAX(hi) FROM hot_paper_selection")
+                total = cur.fetchone()[0]
+
+            for _ in range(_MAX_DRAWS):
+                u = random.uniform(0.0, total)
+                cur.execute(
+                    """
+                    SELECT s.lo, p.used, p.id, p.title, p.summary, p.year, p.arxiv, p.collaboration
+                    FROM hot_paper_selection s JOIN hot_paper_pool p ON p.id = s.id
+                    WHERE s.hi > ? ORDER BY s.hi LIMIT 1
+                    """,
+                    (u,),
+                )
+                row = cur.fetchone()
+                if row is None or row["lo"] > u or row["used"]:
+                    continue  # landed in the slot of an already used paper
+                if last and row["collaboration"] == last:
+                    continue  # no same collaboration two days running
+                paper = dict(row)
+                del paper["lo"], paper["used"]
+                return paper
 
+        logger.info("HotPaperPool: weighted pick found no eligible paper; using a uniform pick")
+        return None
 
     def mark_used(self, pid: str):
         cur = self.conn.cursor()
         cur.execute(
-            "UPDATE hot_paper_pool SET used = 1 WHERE id = ?",
-            (pid,),
+            "UPDATE hot_paper_pool SET used = 1, used_at = ? WHERE id = ?",
+            (datetime.utcnow().isoformat(), pid),
         )
+        cur.execute("DELETE FROM hot_paper_selection WHERE id = ?", (pid,))
         self.conn.commit()
 
     def remaining_count(self) -> int:
@@ -94,7 +285,7 @@ class HotPaperPool:
         return int(row["c"]) if row else 0
 
     def close(self):
-        self.conn.close()
+        close_connection(self.path)
         logger.info("Closed SQLite connection to HotPaperPool %s", self.path)
 
     def fetch_all(self):
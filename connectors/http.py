@@ -0,0 +1,295 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from flowc.config import Config
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+# failures without a response that are worth another attempt
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout)
+ASYNC_RETRY_ERRORS = (httpx.NetworkError, httpx.TimeoutException)
+
+
+def _configured_timeouts() -> dict[str, float]:
+    """HTTP_TIMEOUTS='api.notion.com=15,export.arxiv.org=30' -> {host: seconds}"""
+    timeouts = {}
+    for item in (Config.HTTP_TIMEOUTS or "").split(","):
+        if "=" not in item:
+            continue
+        host, _, seconds = item.partition("=")
+        try:
+            timeouts[host.strip()] = float(seconds)
+        except ValueError:
+            logger.warning("Ignoring malformed HTTP_TIMEOUTS entry: %r", item)
+    return timeouts
+
+
+def _retry_after(resp) -> float | None:
+    """Retry-After header in seconds (delta or HTTP date), if present."""
+    if resp is None or not resp.headers.get("Retry-After"):
+        return None
+    value = resp.headers["Retry-After"].strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(resp, attempt: int, backoff: float) -> float:
+    """Server hint if any, else exponential backoff with full jitter."""
+    delay = _retry_after(resp)
+    if delay is None:
+        delay = random.uniform(0, backoff * 2 ** (attempt - 1))
+    return delay
+
+
+class HttpTransport:
+    """
+    Shared HTTP transport for the connectors.
+
+    - one keep-alive requests.Session per host, with an HTTPAdapter pool
+      of HTTP_POOL_SIZE connections, so repeated calls to the same API
+      reuse their TCP/TLS connection
+    - gzip/deflate negotiated on every session
+    - per-host timeouts (HTTP_TIMEOUTS, default HTTP_TIMEOUT)
+    - optional per-host minimum interval between requests (polite APIs)
+    - one retry loop: connection errors, timeouts and 408/425/429/5xx are
+      retried with exponential backoff and full jitter, honouring
+      Retry-After; other 4xx responses fail immediately
+    """
+
+    def __init__(self, pool_size: int | None = None, timeout: float | None = None):
+        self.pool_size = pool_size or Config.HTTP_POOL_SIZE
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        self.timeouts = _configured_timeouts()
+        self._sessions: dict[str, requests.Session] = {}
+        self._intervals: dict[str, float] = {}
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------
+    # sessions
+    # ----------------------------------------------------------
+    def session(self, host: str) -> requests.Session:
+        with self._lock:
+            sess = self._sessions.get(host)
+            if sess is None:
+                sess = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                sess.mount("https://", adapter)
+                sess.mount("http://", adapter)
+                sess.headers["Accept-Encoding"] = "gzip, deflate"
+                self._sessions[host] = sess
+            return sess
+
+    def set_min_interval(self, host: str, seconds: float):
+        """Space requests to `host` at least `seconds` apart (process-wide)."""
+        with self._lock:
+            self._intervals[host] = seconds
+
+    def _throttle(self, host: str):
+        interval = self._intervals.get(host)
+        if not interval:
+            return
+        # reserve the host's next free slot, then sleep outside the lock
+        # so a throttled host never stalls requests to the others
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    # ----------------------------------------------------------
+    # requests
+    # ----------------------------------------------------------
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retries: int | None = None,
+        backoff: float | None = None,
+        timeout: float | None = None,
+        label: str = "HTTP",
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send one request with retries; returns the successful response
+        or raises the last error (requests.HTTPError for a bad status).
+        """
+        retries = retries or Config.HTTP_RETRIES
+        backoff = Config.HTTP_BACKOFF if backoff is None else backoff
+        host = urlsplit(url).hostname or ""
+        timeout = timeout or self.timeouts.get(host, self.timeout)
+        sess = self.session(host)
+
+        for attempt in range(1, retries + 1):
+            resp = None
+            try:
+                self._throttle(host)
+                resp = sess.request(method, url, timeout=timeout, **kwargs)
+                resp.raise_for_status()
+                return resp
+            except requests.RequestException as exc:
+                if resp is not None:
+                    retryable = resp.status_code in RETRY_STATUS
+                else:
+                    retryable = isinstance(exc, RETRY_ERRORS)
+                if not retryable or attempt == retries:
+                    raise
+                delay = _backoff_delay(resp, attempt, backoff)
+                logger.warning(
+                    "%s %s %s failed (attempt %d/%d): %s; retrying in %.1fs",
+                    label, method, host, attempt, retries, exc, delay,
+                )
+                time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for sess in self._sessions.values():
+                sess.close()
+            self._sessions.clear()
+
+
+_transport: HttpTransport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """Process-wide transport shared by every connector."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport()
+        return _transport
+
+
+class AsyncHttpTransport:
+    """
+    asyncio counterpart of HttpTransport (same pools, timeouts, spacing
+    and retry policy) on one httpx.AsyncClient per host. Clients belong
+    to the running event loop: call aclose() before the loop ends.
+    """
+
+    def __init__(self, pool_size: int | None = None, timeout: float | None = None):
+        self.pool_size = pool_size or Config.HTTP_POOL_SIZE
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        self.timeouts = _configured_timeouts()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._intervals: dict[str, float] = {}
+        self._next_slot: dict[str, float] = {}
+
+    def client(self, host: str) -> httpx.AsyncClient:
+        cli = self._clients.get(host)
+        if cli is None:
+            cli = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+                headers={"Accept-Encoding": "gzip, deflate"},
+            )
+            self._clients[host] = cli
+        return cli
+
+    def set_min_interval(self, host: str, seconds: float):
+        self._intervals[host] = seconds
+
+    async def _throttle(self, host: str):
+        interval = self._intervals.get(host)
+        if not interval:
+            return
+        # reserve the next free slot without holding a lock across the sleep
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, 0.0))
+        self._next_slot[host] = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retries: int | None = None,
+        backoff: float | None = None,
+        timeout: float | None = None,
+        label: str = "HTTP",
+        **kwargs,
+    ) -> httpx.Response:
+        retries = retries or Config.HTTP_RETRIES
+        backoff = Config.HTTP_BACKOFF if backoff is None else backoff
+        host = urlsplit(url).hostname or ""
+        timeout = timeout or self.timeouts.get(host, self.timeout)
+        cli = self.client(host)
+
+        for attempt in range(1, retries + 1):
+            resp = None
+            try:
+                await self._throttle(host)
+                resp = await cli.request(method, url, timeout=timeout, **kwargs)
+                resp.raise_for_status()
+                return resp
+            except httpx.HTTPError as exc:
+                if resp is not None:
+                    retryable = resp.status_code in RETRY_STATUS
+                else:
+                    retryable = isinstance(exc, ASYNC_RETRY_ERRORS)
+                if not retryable or attempt == retries:
+                    raise
+                delay = _backoff_delay(resp, attempt, backoff)
+                logger.warning(
+                    "%s %s %s failed (attempt %d/%d): %s; retrying in %.1fs",
+                    label, method, host, attempt, retries, exc, delay,
+                )
+                await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        clients, self._clients = list(self._clients.values()), {}
+        for cli in clients:
+            await cli.aclose()
+
+
+_async_transport: AsyncHttpTransport | None = None
+
+
+def get_async_transport() -> AsyncHttpTransport:
+    """Transport shared by the async connectors of the current run."""
+    global _async_transport
+    if _async_transport is None:
+        _async_transport = AsyncHttpTransport()
+    return _async_transport
+
+
+async def close_async_transport():
+    global _async_transport
+    if _async_transport is not None:
+        transport, _async_transport = _async_transport, None
+        await transport.aclose()
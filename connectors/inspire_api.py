@@ -1,20 +1,85 @@
 # flowc/connectors/inspire_api.py
 
+import hashlib
+import json
 import logging
-import requests
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from flowc.config import Config
+from flowc.connectors.http import AsyncHttpTransport, HttpTransport, get_async_transport, get_transport
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://inspirehep.net/api/literature"
 
 
+class ResponseCache:
+    """
+    Raw INSPIRE responses on disk, one JSON file per request, expired
+    after `ttl` seconds. Files are replaced atomically so concurrent
+    page fetches never read a half-written entry.
+    """
+
+    def __init__(self, directory: Path | None = None, ttl: int | None = None):
+        self.directory = Path(directory or Config.INSPIRE_CACHE_DIR)
+        self.ttl = Config.INSPIRE_CACHE_TTL if ttl is None else ttl
+
+    @staticmethod
+    def key(params: dict) -> str:
+        raw = json.dumps(params, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        if self.ttl <= 0:
+            return None
+        f = self.directory / f"{key}.json"
+        try:
+            if time.time() - f.stat().st_mtime > self.ttl:
+                return None
+            return json.loads(f.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, data: dict):
+        if self.ttl <= 0:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        f = self.directory / f"{key}.json"
+        tmp = f.with_suffix(f".{os.getpid()}.{time.monotonic_ns()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, f)
+
+
 class InspireAPI:
     """
     Thin wrapper around INSPIRE-HEP literature API.
     """
 
-    def __init__(self, timeout: float = 10.0):
+    def __init__(
+        self,
+        timeout: float | None = None,  # None: per-host HTTP_TIMEOUTS / HTTP_TIMEOUT
+        transport: HttpTransport | None = None,
+        cache: ResponseCache | None = None,
+    ):
         self.timeout = timeout
+        self.http = transport or get_transport()
+        self.cache = cache or ResponseCache()
+
+    @staticmethod
+    def _params(query, size, page, sort, fields) -> dict[str, str | int]:
+        params: dict[str, str | int] = {
+            "q": query,
+            "size": size,
+            "page": page,
+        }
+        if sort:
+            params["sort"] = sort
+        if fields:
+            params["fields"] = fields
+        return params
 
     def fetch(
         self,
@@ -33,19 +98,80 @@ class InspireAPI:
         sort:  e.g. 'mostcited' (optional)
         fields: comma-separated list of fields (optional)
         """
-        params: dict[str, str | int] = {
-            "q": query,
-            "size": size,
-            "page": page,
-        }
-        if sort:
-            params["sort"] = sort
-        if fields:
-            params["fields"] = fields
+        params = self._params(query, size, page, sort, fields)
+        key = self.cache.key(params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.debug("InspireAPI: cache hit for page %d of %r", page, query)
+            return cached
+
+        try:
+            resp = self.http.get(BASE_URL, params=params, timeout=self.timeout, label="InspireAPI")
+        except Exception as exc:
+            logger.error("InspireAPI: request failed: %s", exc)
+            return None
+
+        try:
+            data = resp.json()
+        except Exception as exc:
+            logger.error("InspireAPI: JSON decode failed: %s", exc)
+            return None
+
+        self.cache.set(key, data)
+        return data
+
+    def fetch_pages(
+        self,
+        query: str,
+        pages: list[int],
+        size: int = 25,
+        sort: str | None = None,
+        fields: str | None = None,
+        max_workers: int | None = None,
+    ) -> list[dict | None]:
+        """
+        fetch() for several pages at once, at most `max_workers`
+        (INSPIRE_MAX_CONCURRENCY) in flight. Results follow `pages`.
+        """
+        if not pages:
+            return []
+        workers = max(1, min(max_workers or Config.INSPIRE_MAX_CONCURRENCY, len(pages)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inspire") as pool:
+            return list(pool.map(
+                lambda page: self.fetch(query, size=size, page=page, sort=sort, fields=fields),
+                pages,
+            ))
+
+
+class AsyncInspireAPI:
+    """asyncio variant of InspireAPI; same parameters, None on failure."""
+
+    def __init__(
+        self,
+        timeout: float | None = None,  # None: per-host HTTP_TIMEOUTS / HTTP_TIMEOUT
+        transport: AsyncHttpTransport | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        self.timeout = timeout
+        self.http = transport or get_async_transport()
+        self.cache = cache or ResponseCache()
+
+    async def fetch(
+        self,
+        query: str,
+        size: int = 25,
+        page: int = 1,
+        sort: str | None = None,
+        fields: str | None = None,
+    ) -> dict | None:
+        params = InspireAPI._params(query, size, page, sort, fields)
+        key = self.cache.key(params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
 
         try:
-            resp = requests.get(BASE_URL, params=params, timeout=self.timeout)
-            resp.raise_for_status()
+            resp = await self.http.get(BASE_URL, params=params, timeout=self.timeout, label="InspireAPI")
         except Exception as exc:
             logger.error("InspireAPI: request failed: %s", exc)
             return None
@@ -56,4 +182,5 @@ class InspireAPI:
             logger.error("InspireAPI: JSON decode failed: %s", exc)
             return None
 
+        self.cache.set(key, data)
         return data
@@ -0,0 +1,205 @@
+"""
+Versioned schema of the flowc SQLite database (Config.SQLITE_PATH).
+
+Each migration brings the schema from version N-1 to N and is recorded
+in PRAGMA user_version. Steps are idempotent (IF NOT EXISTS, column
+checks) because databases created before versioning sit at version 0
+with some of these tables already present.
+"""
+
+import logging
+import sqlite3
+
+from flowc.connectors.arxiv_api import normalize_arxiv_id
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(cur, table: str) -> set[str]:
+    return {r[1] for r in cur.execute(f"PRAGMA table_info({table})")}
+
+
+def _001_base(cur):
+    """Original archive and hot paper pool."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS papers (
+            id TEXT PRIMARY KEY,
+            title TEXT,
+            summary TEXT,
+            created_at TEXT
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS hot_paper_pool (
+            id TEXT PRIMARY KEY,        -- internal key (usually arxiv or synthetic)
+            title TEXT NOT NULL,
+            summary TEXT,
+            year INTEGER,
+            arxiv TEXT,                 -- raw arxiv ID as string (may be None)
+            created_at TEXT,
+            used INTEGER DEFAULT 0      -- 0: not used, 1: already consumed
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_hot_paper_title_year
+        ON hot_paper_pool(title, year)
+        """
+    )
+
+
+def _002_near_duplicates(cur):
+    """MinHash signature + LSH buckets; bare, version-free arXiv ids."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS paper_signatures (
+            id TEXT PRIMARY KEY,
+            signature BLOB NOT NULL     -- minhash.NUM_PERM little-endian uint32
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS paper_lsh (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            id TEXT NOT NULL,
+            PRIMARY KEY (band, bucket, id)
+        ) WITHOUT ROWID
+        """
+    )
+
+    # older rows are keyed by the Atom id URL ('http://arxiv.org/abs/2401.01234v2')
+    cur.execute("SELECT COUNT(*) FROM papers WHERE id LIKE 'http%arxiv.org/abs/%'")
+    if cur.fetchone()[0]:
+        cur.connection.create_function("normalize_arxiv_id", 1, normalize_arxiv_id, deterministic=True)
+        cur.execute(
+            "UPDATE OR IGNORE papers SET id = normalize_arxiv_id(id) WHERE id LIKE 'http%arxiv.org/abs/%'"
+        )
+        # rows left behind already exist under their normalized id
+        cur.execute("DELETE FROM papers WHERE id LIKE 'http%arxiv.org/abs/%'")
+        logger.info("Normalized legacy arXiv ids")
+
+
+def _003_ingest_state(cur):
+    """Ingestion watermark per feed: newest `updated` timestamp + id seen."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_state (
+            source TEXT PRIMARY KEY,
+            updated TEXT NOT NULL,      -- ISO-8601 UTC
+            last_id TEXT NOT NULL
+        )
+        """
+    )
+
+
+def _004_bootstrap_progress(cur):
+    """Bootstrap checkpoints: INSPIRE pages already consumed per query."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bootstrap_progress (
+            query TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            added INTEGER,
+            done_at TEXT,
+            PRIMARY KEY (query, page)
+        )
+        """
+    )
+
+
+def _005_hot_paper_selection(cur):
+    """Weighting columns, partial indexes and the weighted selection table."""
+    columns = _columns(cur, "hot_paper_pool")
+    for name, decl in (("citations", "INTEGER"), ("collaboration", "TEXT"), ("used_at", "TEXT")):
+        if name not in columns:
+            cur.execute(f"ALTER TABLE hot_paper_pool ADD COLUMN {name} {decl}")
+    # unused rows only, ordered by rowid: O(log n) random probes
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_hot_paper_unused
+        ON hot_paper_pool(used) WHERE used = 0
+        """
+    )
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_hot_paper_used_at
+        ON hot_paper_pool(used_at) WHERE used = 1
+        """
+    )
+    # each unused paper owns [lo, hi) of the cumulative weight line
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS hot_paper_selection (
+            hi REAL PRIMARY KEY,
+            lo REAL NOT NULL,
+            id TEXT NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_hot_paper_selection_id ON hot_paper_selection(id)"
+    )
+
+
+def _006_ranker_state(cur):
+    """Persisted RelevanceRanker counts, caught up from papers by rowid."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ranker_terms (
+            term TEXT PRIMARY KEY,
+            df INTEGER NOT NULL,        -- archived papers containing the term
+            tf REAL NOT NULL            -- summed length-normalized frequency
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ranker_state (
+            name TEXT PRIMARY KEY,      -- 'n_docs', 'last_rowid'
+            value INTEGER NOT NULL
+        )
+        """
+    )
+
+
+MIGRATIONS = [
+    _001_base,
+    _002_near_duplicates,
+    _003_ingest_state,
+    _004_bootstrap_progress,
+    _005_hot_paper_selection,
+    _006_ranker_state,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply pending migrations; returns the resulting schema version.
+    Runs under BEGIN IMMEDIATE so concurrent processes migrate once.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return version
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # re-read under the write lock: another process may have won
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        cur = conn.cursor()
+        for number, step in enumerate(MIGRATIONS[version:], start=version + 1):
+            step(cur)
+            logger.info("Applied schema migration %d (%s)", number, step.__name__.lstrip("_"))
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return SCHEMA_VERSION
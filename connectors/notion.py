@@ -1,14 +1,18 @@
 import logging
-import time
 
-import requests
 from flowc.config import Config
+from flowc.connectors.http import AsyncHttpTransport, HttpTransport, get_async_transport, get_transport
 
 
 logger = logging.getLogger(__name__)
 
 class NotionClient:
-    def __init__(self):
+    def __init__(self, transport: HttpTransport | None = None):
+        self._configure()
+        self.http = transport or get_transport()
+
+    def _configure(self):
+        """Token check and headers, shared with AsyncNotionClient."""
         if not Config.NOTION_TOKEN:
             raise RuntimeError("NOTION_TOKEN not set")
         self.headers = {
@@ -18,22 +22,14 @@ class NotionClient:
         }
 
     def _request(self, method: str, url: str, *, retries: int = 3, retry_delay: float = 1.0, fallback=None, **kwargs):
-        last_error = None
-        for attempt in range(1, retries + 1):
-            try:
-                res = requests.request(method, url, headers=self.headers, timeout=10, **kwargs)
-                res.raise_for_status()
-                return res.json()
-            except Exception as exc:  # noqa: BLE001
-                last_error = exc
-                logger.warning(
-                    "Notion request failed (attempt %s/%s): %s", attempt, retries, exc
-                )
-                if attempt < retries:
-                    time.sleep(retry_delay * attempt)
-
-        logger.error("Notion request failed after %s attempts: %s", retries, last_error)
-        return fallback
+        try:
+            res = self.http.request(
+                method, url, headers=self.headers, retries=retries, backoff=retry_delay, label="Notion", **kwargs
+            )
+            return res.json()
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Notion request failed after %s attempts: %s", retries, exc)
+            return fallback
 
     def query_by_date(self, db_id, date_str):
         url = f"https://api.notion.com/v1/databases/{db_id}/query"
@@ -66,3 +62,43 @@ class NotionClient:
             return "\n".join(b.get("plain_text", "") for b in blocks).strip()
         except Exception:
             return ""
+
+
+class AsyncNotionClient(NotionClient):
+    """
+    asyncio variant of NotionClient: the same requests and fallbacks,
+    awaited on the async transport. get_text is shared.
+    """
+
+    def __init__(self, transport: AsyncHttpTransport | None = None):
+        self._configure()
+        self.http = transport or get_async_transport()
+
+    async def _request(self, method: str, url: str, *, retries: int = 3, retry_delay: float = 1.0, fallback=None, **kwargs):
+        try:
+            res = await self.http.request(
+                method, url, headers=self.headers, retries=retries, backoff=retry_delay, label="Notion", **kwargs
+            )
+            return res.json()
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Notion request failed after %s attempts: %s", retries, exc)
+            return fallback
+
+    async def query_by_date(self, db_id, date_str):
+        url = f"https://api.notion.com/v1/databases/{db_id}/query"
+        payload = {"filter": {"property": "Date", "date": {"equals": date_str}}}
+        res = await self._request("POST", url, json=payload, fallback={"results": []})
+        results = res.get("results", []) if res else []
+        logger.info("Notion query by date %s returned %d result(s)", date_str, len(results))
+        return results[0] if results else None
+
+    async def update_page(self, page_id, properties):
+        url = f"https://api.notion.com/v1/pages/{page_id}"
+        logger.info("Updating Notion page %s with fields: %s", page_id, ", ".join(properties.keys()))
+        return await self._request("PATCH", url, json={"properties": properties}, fallback={})
+
+    async def create_page(self, db_id, properties):
+        url = "https://api.notion.com/v1/pages"
+        payload = {"parent": {"database_id": db_id}, "properties": properties}
+        logger.info("Creating Notion page in DB %s", db_id)
+        return await self._request("POST", url, json=payload, fallback={})
@@ -0,0 +1,66 @@
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+from flowc.config import Config
+from flowc.connectors.migrations import migrate
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_migrated: set[Path] = set()
+_migrate_lock = threading.Lock()
+
+
+def _open(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        path,
+        timeout=Config.SQLITE_BUSY_TIMEOUT / 1000,
+        cached_statements=Config.SQLITE_CACHED_STATEMENTS,
+        isolation_level="",  # implicit transactions, commit() as before
+    )
+    conn.row_factory = sqlite3.Row  # dict-like rows
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(Config.SQLITE_BUSY_TIMEOUT)}")
+    conn.execute(f"PRAGMA mmap_size={int(Config.SQLITE_MMAP_SIZE)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def get_connection(path: str | Path | None = None) -> sqlite3.Connection:
+    """
+    The calling thread's connection to `path` (default SQLITE_PATH).
+
+    Connections are opened once per thread and reused, with WAL,
+    synchronous=NORMAL, mmap and a busy timeout so overlapping runs wait
+    for the lock instead of failing. The schema is migrated once per
+    process on first use.
+    """
+    path = Path(path or Config.SQLITE_PATH).resolve()
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+
+    conn = conns.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = _open(path)
+        conns[path] = conn
+
+    if path not in _migrated:
+        with _migrate_lock:
+            if path not in _migrated:
+                version = migrate(conn)
+                _migrated.add(path)
+                logger.info("SQLite %s at schema version %d", path, version)
+    return conn
+
+
+def close_connection(path: str | Path | None = None):
+    """Close the calling thread's connection to `path`, if open."""
+    path = Path(path or Config.SQLITE_PATH).resolve()
+    conn = getattr(_local, "conns", {}).pop(path, None)
+    if conn is not None:
+        conn.close()
@@ -1,12 +1,16 @@
-import requests
-import time
 import logging
 from flowc.config import Config
+from flowc.connectors.http import AsyncHttpTransport, HttpTransport, get_async_transport, get_transport
 
 logger = logging.getLogger(__name__)
 
 class TelegramClient:
-    def __init__(self):
+    def __init__(self, transport: HttpTransport | None = None):
+        self._configure()
+        self.http = transport or get_transport()
+
+    def _configure(self):
+        """Config check and bot URL, shared with AsyncTelegramClient."""
         if not Config.TELEGRAM_BOT_TOKEN or not Config.TELEGRAM_CHAT_ID:
             raise RuntimeError("Telegram config not set")
         self.base_url = f"https://api.telegram.org/bot{Config.TELEGRAM_BOT_TOKEN}"
@@ -26,27 +30,45 @@ class TelegramClient:
             "parse_mode": parse_mode,
         }
 
-        last_error = None
+        try:
+            res = self.http.post(url, json=payload, retries=retries, backoff=retry_delay, label="Telegram")
+            logger.info("Telegram message sent successfully")
+            return res.json()
+        except Exception as exc:
+            logger.error("Telegram send failed after %s attempts: %s", retries, exc)
+            if fallback_ok:
+                return {"ok": False, "error": str(exc)}
+            raise
 
-        for attempt in range(1, retries + 1):
-            try:
-                res = requests.post(url, json=payload, timeout=10)
-                res.raise_for_status()
-                logger.info("Telegram message sent successfully (attempt %s)", attempt)
-                return res.json()
 
-            except Exception as exc:
-                last_error = exc
-                logger.warning(
-                    "Telegram send failed (attempt %s/%s): %s",
-                    attempt, retries, exc
-                )
-                if attempt < retries:
-                    time.sleep(retry_delay * attempt)
+class AsyncTelegramClient(TelegramClient):
+    """asyncio variant of TelegramClient.send with the same fallback."""
 
-        logger.error("Telegram send failed after %s attempts: %s", retries, last_error)
+    def __init__(self, transport: AsyncHttpTransport | None = None):
+        self._configure()
+        self.http = transport or get_async_transport()
 
-        if fallback_ok:
-            return {"ok": False, "error": str(last_error)}
+    async def send(
+        self,
+        text: str,
+        parse_mode: str = "Markdown",
+        retries: int = 3,
+        retry_delay: float = 2.0,
+        fallback_ok: bool = True,
+    ):
+        url = f"{self.base_url}/sendMessage"
+        payload = {
+            "chat_id": Config.TELEGRAM_CHAT_ID,
+            "text": text,
+            "parse_mode": parse_mode,
+        }
 
-        raise last_error
+        try:
+            res = await self.http.post(url, json=payload, retries=retries, backoff=retry_delay, label="Telegram")
+            logger.info("Telegram message sent successfully")
+            return res.json()
+        except Exception as exc:
+            logger.error("Telegram send failed after %s attempts: %s", retries, exc)
+            if fallback_ok:
+                return {"ok": False, "error": str(exc)}
+            raise
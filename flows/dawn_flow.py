@@ -1,5 +1,6 @@
 import logging
 
+from flowc.config import Config
 from flowc.services.notion_service import NotionService
 from flowc.services.arxiv_service import ArxivService
 from flowc.connectors.hot_paper_pool import HotPaperPool
@@ -17,9 +18,17 @@ class DawnFlow:
     def run(self) -> str:
         logger.info("Starting dawn flow: carrying TODO forward")
         self.notion.carry_over()
+        return self._pick_hot_paper()
 
+    async def run_async(self) -> str:
+        logger.info("Starting dawn flow (async): carrying TODO forward")
+        await self.notion.carry_over_async()
+        # local SQLite/YAML work; the pool connection belongs to this thread
+        return self._pick_hot_paper()
+
+    def _pick_hot_paper(self) -> str:
         logger.info("Dawn flow: selecting today's hot paper from pool")
-        paper = self.pool.get_one_unused()
+        paper = self.pool.get_one_unused(weighted=Config.HOTPAPER_WEIGHTED)
         if not paper:
             logger.warning("Dawn flow: no unused hot papers left in pool")
             self.arxiv.save_hot_papers({"papers": []})
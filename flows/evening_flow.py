@@ -1,4 +1,7 @@
+import asyncio
+import contextvars
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from flowc.services.notion_service import NotionService
 from flowc.services.telegram_digest_service import TelegramDigestService
@@ -7,13 +10,21 @@ from flowc.services.email_report_service import EmailReportService
 from flowc.services.arxiv_service import ArxivService
 from flowc.services.archive_service import ArchiveService
 
-from flowc.ai.summary import rewrite_daily_log, summarize_commits, summarize_arxiv
+from flowc.ai.summary import (
+    rewrite_daily_log_many,
+    rewrite_daily_log_stream,
+    summarize_commits_many,
+    summarize_arxiv_many,
+)
+from flowc.ai.prompt_manager import PromptManager
+from flowc.ai.telemetry import flow_run
 
 logger = logging.getLogger(__name__)
 
 
 class EveningFlow:
     def __init__(self):
+        PromptManager.preload()
         self.notion = NotionService()
         self.telegram = TelegramDigestService()
         self.commit = CommitService()
@@ -22,22 +33,37 @@ class EveningFlow:
         self.archive = ArchiveService()
 
     def run(self):
+        with flow_run("evening"):
+            return self._run()
+
+    def _run(self):
         logger.info("Starting evening flow")
 
         # ------------------------------------------------
-        # 1) Commit
+        # 1) Inputs: commits, Notion page, arXiv candidates
         # ------------------------------------------------
-        commit_results = self._process_commits()
+        logger.info("Fetching commits, today's Notion page and arXiv papers")
+        raw_commit = self.commit.get_raw()
+        page = self.notion.get_today_page(self.notion.db_id)
+        papers = self.arxiv.run()  # SQLite work stays on this thread
 
         # ------------------------------------------------
-        # 2) Notion Summary (AI)
+        # 2) AI: commit, Notion and arXiv sections run concurrently
         # ------------------------------------------------
-        notion_results = self._process_notion(commit_results)
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="flowc-evening") as pool:
+            # copy the caller's context so telemetry keeps the flow run
+            commit_f = pool.submit(contextvars.copy_context().run, self._summarize_commits, raw_commit)
+            notion_f = pool.submit(contextvars.copy_context().run, self._rewrite_notion, page) if page else None
+            arxiv_f = pool.submit(contextvars.copy_context().run, self._summarize_arxiv, papers)
+            commit_results = commit_f.result()
+            rewrites = notion_f.result() if notion_f else None
+            arxiv_summaries = arxiv_f.result()
 
         # ------------------------------------------------
-        # 3) Arxiv (AI)
+        # 3) Notion write-back, arXiv archive
         # ------------------------------------------------
-        arxiv_results = self._process_arxiv()
+        notion_results = self._write_notion(page, rewrites, commit_results)
+        arxiv_results = self._publish_arxiv(papers, arxiv_summaries)
 
         # ------------------------------------------------
         # 4) Email
@@ -60,28 +86,12 @@ class EveningFlow:
         #
         # 6) Archieving
         #
-        self.archive.save_html("email.html", email_html)
-        self.archive.save_text("telegram.txt", telegram_msg.strip())
-
-        # Notion summaries
-        self.archive.save_text("notion_email.txt", notion_results["email"])
-        self.archive.save_text("notion_telegram.txt", notion_results["telegram"])
-
-        # Commit summaries
-        self.archive.save_text("commit_email.txt", commit_results["email"])
-        self.archive.save_text("commit_telegram.txt", commit_results["telegram"])
-
-        # Arxiv summaries
-        self.archive.save_html("arxiv_email.html", arxiv_results["email"])
-        self.archive.save_text("arxiv_telegram.txt", arxiv_results["telegram"])
+        self._archive_results(email_html, telegram_msg, commit_results, notion_results, arxiv_results)
         logger.info("Evening flow completed")
     # ========================================================================
     # Commit Section
     # ========================================================================
-    def _process_commits(self):
-        logger.info("Fetching and summarizing commits")
-        raw_commit = self.commit.get_raw()
-
+    def _summarize_commits(self, raw_commit):
         result = {
             "notion": None,
             "email": "",
@@ -93,81 +103,96 @@ class EveningFlow:
             result["telegram"] = "No commits today."
             return result
 
-        # AI summarization (separate prompts)
-        summary_for_notion = summarize_commits(raw_commit)
-        summary_for_telegram = summarize_commits(raw_commit, mode = "telegram")
-        summary_for_email = summarize_commits(raw_commit, mode = "email")
+        # AI summarization (all three channels in one structured completion)
+        summaries = summarize_commits_many(raw_commit, modes=("notion", "telegram", "email"))
 
         logger.info("Commit summaries generated (notion/telegram/email)")
 
         # prepare outputs
-        result["notion"] = summary_for_notion
-        result["telegram"] = summary_for_telegram
-        result["email"] = summary_for_email
+        result["notion"] = summaries["notion"]
+        result["telegram"] = summaries["telegram"]
+        result["email"] = summaries["email"]
 
         return result
 
     # ========================================================================
     # Notion Section
     # ========================================================================
-    def _process_notion(self, commit_results):
-        logger.info("Fetching today's Notion page for evening flow")
-        page = self.notion.get_today_page(self.notion.db_id)
+    def _write_notion(self, page, rewrites, commit_results):
         if not page:
-            logger.warning("No Notion page found for today; skipping Notion summaries")
-            return {
-                "telegram": "No notion page today.",
-                "email": "No notion page today.",
-            }
-        raw_todo = self.notion.read_todo(page)
-        raw_time = self.notion.read_time_summary(page)
-        raw_sum = self.notion.read_summary(page)
-
-        daily_log = f"TODO for Today:\n{raw_todo}\n\nSummary:\n{raw_sum}\n\n{raw_time}"
-
-        # Three versions
-        ai_telegram = rewrite_daily_log(daily_log, mode="telegram")
-        ai_email = rewrite_daily_log(daily_log, mode="email")
-        ai_notion = rewrite_daily_log(daily_log, mode="notion")
-        logger.info("AI daily log rewrites generated for all channels")
+            return self._no_notion_page()
 
         # Write to Notion
         if commit_results["notion"]:
             self.notion.write_git_summary(page["id"], commit_results["notion"])
             logger.info("Wrote commit summary to Notion")
 
-        self.notion.write_ai_summary(page["id"], ai_notion)
+        self.notion.write_ai_summary(page["id"], rewrites["notion"])
         logger.info("Wrote AI daily summary to Notion")
 
         return {
-            "telegram": ai_telegram,
-            "email": ai_email,
+            "telegram": rewrites["telegram"],
+            "email": rewrites["email"],
+        }
+
+    def _no_notion_page(self):
+        logger.warning("No Notion page found for today; skipping Notion summaries")
+        # with a page, _rewrite_notion streams notion_email.txt instead
+        self.archive.save_text("notion_email.txt", "No notion page today.")
+        return {
+            "telegram": "No notion page today.",
+            "email": "No notion page today.",
         }
 
+    def _rewrite_notion(self, page):
+        raw_todo = self.notion.read_todo(page)
+        raw_time = self.notion.read_time_summary(page)
+        raw_sum = self.notion.read_summary(page)
+
+        daily_log = f"TODO for Today:\n{raw_todo}\n\nSummary:\n{raw_sum}\n\n{raw_time}"
+
+        # Three versions: the short ones in one completion on a worker,
+        # while the long email rewrite streams into today's archive (a
+        # stalled stream is cut off by AI_STREAM_STALL_TIMEOUT)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="flowc-rewrite") as pool:
+            short = pool.submit(
+                contextvars.copy_context().run, rewrite_daily_log_many, daily_log, ("telegram", "notion")
+            )
+            email_path = self.archive.save_stream("notion_email.txt", rewrite_daily_log_stream(daily_log, "email"))
+            rewrites = short.result()
+        rewrites["email"] = email_path.read_text(encoding="utf-8")
+        logger.info("AI daily log rewrites generated for all channels")
+        return rewrites
+
     # ========================================================================
     # Arxiv Section
     # ========================================================================
-    def _process_arxiv(self):
-        logger.info("Fetching and filtering arXiv papers")
-        papers = self.arxiv.run()
+    @staticmethod
+    def _summarize_arxiv(papers):
+        if not papers:
+            return None
+        summaries = summarize_arxiv_many(papers, modes=("email", "telegram"))
+        logger.info("Generated arXiv summaries for email and Telegram")
+        return summaries
 
+    def _publish_arxiv(self, papers, summaries):
         if not papers:
             logger.info("No interesting arXiv papers found today")
+            self.arxiv.commit_watermark()
             return {
                 "telegram": "No interesting new papers today.",
                 "email": "<p>No interesting new papers today.</p>",
             }
 
-        summaries_default = summarize_arxiv(papers, mode = "email")
-        summaries_telegram = summarize_arxiv(papers, mode = "telegram")
-        logger.info("Generated arXiv summaries for email and Telegram")
+        summaries_default = summaries["email"]
+        summaries_telegram = summaries["telegram"]
+
+        inserted, _ = self.arxiv.save_many(papers, summaries_default)
+        logger.info("Saved %d arXiv paper(s) to archive", inserted)
+        self.arxiv.commit_watermark()
 
         # HTML (email)
-        html_blocks = []
-        for p, s in zip(papers, summaries_default):
-            self.arxiv.save(p["id"], p["title"], s)
-            logger.info("Saved arXiv paper %s to archive", p["id"])
-            html_blocks.append(self.arxiv.format_html(p, s))
+        html_blocks = [self.arxiv.format_html(p, s) for p, s in zip(papers, summaries_default)]
 
         return {
             "telegram": "\n".join(
@@ -181,18 +206,94 @@ class EveningFlow:
     # ========================================================================
     def _process_email(self, notion_email, commit_email, arxiv_email):
         logger.info("Composing and sending evening email report")
-        email_html = self.email.build_html(
+        email_html = self._build_email(notion_email, commit_email, arxiv_email)
+        self.email.send(email_html)
+        logger.info("Evening email report sent")
+        return email_html
+
+    def _build_email(self, notion_email, commit_email, arxiv_email):
+        return self.email.build_html(
             summary=notion_email,
             commits_html=commit_email,
             arxiv_text=arxiv_email,
         )
-        self.email.send(email_html)
-        logger.info("Evening email report sent")
-        return email_html
 
     def _process_telegram(self, commit_telegram, notion_telegram, arxiv_telegram):
         logger.info("Sending evening Telegram digest")
         telegram_msg = self.telegram.build_message_for_evening(commit_telegram, notion_telegram, arxiv_telegram)
         self.telegram.send(telegram_msg)
         logger.info("Evening Telegram digest sent")
-        return telegram_msg
\ No newline at end of file
+        return telegram_msg
+
+    # ========================================================================
+    # Archive Section
+    # ========================================================================
+    def _archive_results(self, email_html, telegram_msg, commit_results, notion_results, arxiv_results):
+        self.archive.save_html("email.html", email_html)
+        self.archive.save_text("telegram.txt", telegram_msg.strip())
+
+        # Notion summaries (notion_email.txt is written where it is produced)
+        self.archive.save_text("notion_telegram.txt", notion_results["telegram"])
+
+        # Commit summaries
+        self.archive.save_text("commit_email.txt", commit_results["email"])
+        self.archive.save_text("commit_telegram.txt", commit_results["telegram"])
+
+        # Arxiv summaries
+        self.archive.save_html("arxiv_email.html", arxiv_results["email"])
+        self.archive.save_text("arxiv_telegram.txt", arxiv_results["telegram"])
+
+    # ========================================================================
+    # asyncio runner (flows.runner)
+    # ========================================================================
+    async def run_async(self):
+        with flow_run("evening"):
+            return await self._run_async()
+
+    async def _run_async(self):
+        """
+        Same steps as _run(), with the I/O overlapped on one loop as well:
+        git, Notion and arXiv are fetched together, the three AI stages run
+        concurrently on worker threads, and email/Telegram go out together.
+        SQLite work (arXiv filtering and saving) stays on the loop thread.
+        """
+        logger.info("Starting evening flow (async)")
+
+        raw_commit, page, papers = await asyncio.gather(
+            self.commit.get_raw_async(),
+            self.notion.get_today_page_async(self.notion.db_id),
+            self.arxiv.run_async(),
+        )
+
+        commit_results, rewrites, arxiv_summaries = await asyncio.gather(
+            asyncio.to_thread(self._summarize_commits, raw_commit),
+            asyncio.to_thread(self._rewrite_notion, page) if page else asyncio.sleep(0),
+            asyncio.to_thread(self._summarize_arxiv, papers),
+        )
+
+        if page:
+            writes = [self.notion.write_ai_summary_async(page["id"], rewrites["notion"])]
+            if commit_results["notion"]:
+                writes.append(self.notion.write_git_summary_async(page["id"], commit_results["notion"]))
+            await asyncio.gather(*writes)
+            logger.info("Wrote AI summaries to Notion")
+            notion_results = {"telegram": rewrites["telegram"], "email": rewrites["email"]}
+        else:
+            notion_results = self._no_notion_page()
+
+        arxiv_results = self._publish_arxiv(papers, arxiv_summaries)
+
+        email_html = self._build_email(
+            notion_results["email"], commit_results["email"], arxiv_results["email"]
+        )
+        telegram_msg = self.telegram.build_message_for_evening(
+            commit_results["telegram"], notion_results["telegram"], arxiv_results["telegram"]
+        )
+        await asyncio.gather(
+            self.email.send_async(email_html),
+            self.telegram.send_async(telegram_msg),
+        )
+        logger.info("Evening email report and Telegram digest sent")
+
+        self._archive_results(email_html, telegram_msg, commit_results, notion_results, arxiv_results)
+        logger.info("Evening flow completed")
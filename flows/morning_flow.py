@@ -1,20 +1,28 @@
+import asyncio
 import logging
 
 from flowc.services.notion_service import NotionService
 from flowc.services.telegram_digest_service import TelegramDigestService
 from flowc.services.arxiv_service import ArxivService
 from flowc.ai.summary import rewrite_daily_todo
+from flowc.ai.prompt_manager import PromptManager
+from flowc.ai.telemetry import flow_run
 
 logger = logging.getLogger(__name__)
 
 
 class MorningFlow:
     def __init__(self):
+        PromptManager.preload()
         self.notion = NotionService()
         self.telegram = TelegramDigestService()
         self.arxiv = ArxivService() 
 
     def run(self) -> str:
+        with flow_run("morning"):
+            return self._run()
+
+    def _run(self) -> str:
         logger.info("Starting morning flow: preparing TODO digest")
         page = self.notion.get_today_page(self.notion.db_id)
         if not page:
@@ -39,6 +47,31 @@ class MorningFlow:
 
         return message
 
+    async def run_async(self) -> str:
+        with flow_run("morning"):
+            return await self._run_async()
+
+    async def _run_async(self) -> str:
+        logger.info("Starting morning flow (async): preparing TODO digest")
+        # Notion query and the local hot-paper file are independent
+        page, hot = await asyncio.gather(
+            self.notion.get_today_page_async(self.notion.db_id),
+            asyncio.to_thread(self.arxiv.get_hot_pick),
+        )
+        raw_todo = self.notion.read_todo(page) if page else ""
+        if not page:
+            logger.info("No Notion page found for today; sending empty TODO list")
+
+        rewritten = await asyncio.to_thread(rewrite_daily_todo, raw_todo)
+        logger.info("Rewrote TODO list with AI; preparing morning Telegram digest")
+        if not hot:
+            logger.warning("No HotPaper available for today")
+
+        msg = self.telegram.build_message_for_morning(page, rewritten, hot or None)
+        await self.telegram.send_async(msg)
+        logger.info("Sent morning Telegram digest")
+        return msg
+
     def _process_telegram(self, page, todo, hot):
         msg = self.telegram.build_message_for_morning(page, todo, hot)
         self.telegram.send(msg)
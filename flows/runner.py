@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import logging
+
+from flowc.connectors.http import close_async_transport
+from flowc.flows.dawn_flow import DawnFlow
+from flowc.flows.evening_flow import EveningFlow
+from flowc.flows.morning_flow import MorningFlow
+
+logger = logging.getLogger(__name__)
+
+FLOWS = {
+    "dawn": DawnFlow,
+    "morning": MorningFlow,
+    "evening": EveningFlow,
+}
+
+
+async def run_flow_async(name: str):
+    """Run one flow on the current event loop via its async connectors."""
+    flow = FLOWS[name]()
+    try:
+        return await flow.run_async()
+    finally:
+        await close_async_transport()
+
+
+def run_flow(name: str, *, use_async: bool = True):
+    """Run a flow by name; the async path overlaps independent I/O."""
+    if use_async:
+        return asyncio.run(run_flow_async(name))
+    return FLOWS[name]().run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="flowc run", description="Run a flowc flow.")
+    parser.add_argument("flow", choices=sorted(FLOWS))
+    parser.add_argument("--sync", action="store_true", help="use the blocking connectors")
+    args = parser.parse_args(argv)
+
+    result = run_flow(args.flow, use_async=not args.sync)
+    if isinstance(result, str):
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
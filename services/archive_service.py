@@ -33,3 +33,17 @@ class ArchiveService:
         full.write_text(html or "", encoding="utf-8")
         logger.info("Saved HTML archive to %s", full)
         return full
+
+    def save_stream(self, filename: str, chunks):
+        """
+        Write text chunks (e.g. from AI.ask_stream) to today's archive
+        as they arrive.
+        """
+        path = self.get_today_dir()
+        full = path / filename
+        with full.open("w", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                f.flush()
+        logger.info("Saved streamed archive to %s", full)
+        return full
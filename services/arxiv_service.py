@@ -1,13 +1,19 @@
+import io
 import logging
 import xml.etree.ElementTree as ET
 import os
 import yaml
-import dateutil.parser as dp
+from bisect import bisect_left
 from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 
-from flowc.connectors.arxiv_api import ArxivAPI
+from flowc.config import Config
+from flowc.connectors.arxiv_api import ArxivAPI, AsyncArxivAPI, normalize_arxiv_id
 from flowc.connectors.db import PaperDatabase
 from flowc.ai.keyword_engine import KeywordEngine
+from flowc.ai.relevance_ranker import RelevanceRanker
+from flowc.utils.keyword_matcher import KeywordMatcher
+from flowc.utils.minhash import LSHIndex, paper_signature
 
 HOT_PAPER_PATH = os.path.join(
     os.path.dirname(__file__),
@@ -16,102 +22,345 @@ HOT_PAPER_PATH = os.path.join(
     "hot_papers.yaml"
 )
 
+# generic title hints that mark a paper as in scope even without a keyword hit
+TITLE_HINTS = ("phys", "hep")
+
+# ingest_state key for the arXiv feed watermark
+WATERMARK_SOURCE = "arxiv"
+
+# weight of the local relevance score (0..1) next to keyword hits
+RELEVANCE_WEIGHT = 4.0
+
 logger = logging.getLogger(__name__)
 
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ENTRY = _ATOM + "entry"
+# direct entry children kept in a paper record
+_ENTRY_FIELDS = {
+    _ATOM + "id": "link",
+    _ATOM + "title": "title",
+    _ATOM + "summary": "summary",
+    _ATOM + "updated": "updated",
+}
+
+_updated = itemgetter("updated")
+
+
+def _parse_timestamp(text: str) -> datetime:
+    ts = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    # ensure updated is aware (UTC)
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def parse_atom(raw: str, strict: bool = False) -> list[dict]:
+    """
+    One streaming pass over an arXiv Atom page: each <entry> becomes a
+    compact record as soon as it closes, and processed elements are
+    cleared so the tree never holds more than one entry. A malformed
+    page gives [] (or raises, when `strict`).
+    """
+    if not raw:
+        return []
+
+    papers = []
+    root = None
+    fields = None
+    depth = 0
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(raw.encode("utf-8")), events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                elif elem.tag == _ENTRY:
+                    fields = {}
+                    depth = 0
+                elif fields is not None:
+                    depth += 1
+                continue
+
+            if fields is None:
+                continue  # feed-level metadata
+            if elem.tag == _ENTRY:
+                link = fields["link"]
+                papers.append({
+                    "id": normalize_arxiv_id(link),
+                    "title": fields.get("title", ""),
+                    "summary": fields.get("summary", ""),
+                    "link": link,
+                    "updated": _parse_timestamp(fields["updated"]),
+                })
+                fields = None
+                root.clear()
+                continue
+
+            if depth == 1 and elem.tag in _ENTRY_FIELDS:
+                fields[_ENTRY_FIELDS[elem.tag]] = (elem.text or "").strip()
+            depth -= 1
+    except (ET.ParseError, KeyError, ValueError) as exc:
+        if strict:
+            raise
+        logger.warning("Could not parse arXiv Atom feed: %s", exc)
+        return []
+
+    return papers
+
+
+class _IngestBatch:
+    """Feed pages collected newest-first until the watermark is reached."""
+
+    def __init__(self, watermark: tuple[datetime, str]):
+        self.watermark = watermark
+        self.papers: dict[str, dict] = {}
+        self.newest = None
+        self.reached = False
+        self.pages = 0
+        self.error = None
+
+    def add_raw(self, raw: str) -> bool:
+        """
+        Absorb one raw Atom page; True once no further page is needed.
+        A failed fetch ("") or a malformed page stops paging with
+        `error` set, leaving the watermark unreached.
+        """
+        if not raw:
+            self.error = f"fetch of page {self.pages + 1} failed"
+            return True
+        try:
+            page = parse_atom(raw, strict=True)
+        except (ET.ParseError, KeyError, ValueError) as exc:
+            self.error = f"page {self.pages + 1} could not be parsed ({exc})"
+            return True
+        self.pages += 1
+        return self.add(sorted(page, key=_updated))
+
+    def add(self, page: list[dict]) -> bool:
+        """Absorb one parsed page; True once no further page is needed."""
+        fresh = [p for p in page if (p["updated"], p["id"]) > self.watermark]
+        for p in fresh:
+            self.papers.setdefault(p["id"], p)  # entries can shift between pages
+        if page:
+            top = max((p["updated"], p["id"]) for p in page)
+            if self.newest is None or top > self.newest:
+                self.newest = top
+        if len(fresh) < len(page) or len(page) < Config.ARXIV_PAGE_SIZE:
+            self.reached = True
+        return self.reached
+
+
 class ArxivService:
     def __init__(self):
         self.api = ArxivAPI()
         self.db = PaperDatabase()
         self.keyword_engine = KeywordEngine()
+        self._ranker = None
+        self._pending_watermark = None
+        self._aapi = None
+
+    @property
+    def ranker(self) -> RelevanceRanker:
+        """BM25 ranker over the archive, built on first use."""
+        if self._ranker is None:
+            self._ranker = RelevanceRanker.from_database(
+                self.db, self.keyword_engine.base_keywords
+            )
+        return self._ranker
 
     def fetch_raw(self) -> str:
         logger.info("Fetching arXiv feed")
         return self.api.fetch()
 
-    def parse(self, raw: str, days=1) -> list[dict]:
-        if not raw:
-            return []
-
-        try:
-            root = ET.fromstring(raw)
-        except ET.ParseError:
-            return []
-
-        ns = {"atom": "http://www.w3.org/2005/Atom"}
+    def parse_entries(self, raw: str) -> list[dict]:
+        """Every entry of one Atom page, oldest `updated` first."""
+        papers = parse_atom(raw)
+        papers.sort(key=_updated)
+        return papers
 
+    @staticmethod
+    def within(papers: list[dict], days) -> list[dict]:
+        """Tail of an `updated`-sorted list newer than `days` ago (bisect, no re-parse)."""
         # UTC awareness
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        return papers[bisect_left(papers, cutoff, key=_updated):]
 
-        papers = []
-
-        for entry in root.findall("atom:entry", ns):
-            updated_str = entry.find("atom:updated", ns).text
-            updated = dp.parse(updated_str)
-
-            # ensure updated is aware (UTC)
-            if updated.tzinfo is None:
-                updated = updated.replace(tzinfo=timezone.utc)
-            else:
-                updated = updated.astimezone(timezone.utc)
-
-            # filter
-            if updated < cutoff:
-                continue
-
-            papers.append({
-                "id": entry.find("atom:id", ns).text,
-                "title": entry.find("atom:title", ns).text.strip(),
-                "summary": entry.find("atom:summary", ns).text.strip(),
-                "link": entry.find("atom:id", ns).text,
-                "updated": updated,
-            })
-
+    def parse(self, raw: str, days=1) -> list[dict]:
+        papers = self.within(self.parse_entries(raw), days)
         logger.info("Parsed %d entries after date filter", len(papers))
         return papers
 
-    def filter_interesting(self, papers: list[dict]) -> list[dict]:
-        ai_keywords = self.keyword_engine.generate(papers[:20])
-
-        all_keywords = set(self.keyword_engine.base_keywords) | set(ai_keywords)
+    # ----------------------------------------------------------
+    # incremental ingestion
+    # ----------------------------------------------------------
+    @staticmethod
+    def _floor(watermark: tuple[datetime, str] | None) -> tuple[datetime, str]:
+        if watermark is None:
+            return (datetime.now(timezone.utc) - timedelta(days=Config.ARXIV_LOOKBACK_DAYS), "")
+        return watermark
+
+    def fetch_new(self, watermark: tuple[datetime, str] | None) -> list[dict]:
+        """
+        Entries updated after `watermark` (or within ARXIV_LOOKBACK_DAYS
+        when there is none yet), paging back through the feed only until
+        the watermark is reached. Remembers the newest entry seen so
+        commit_watermark() can advance past it.
+        """
+        batch = _IngestBatch(self._floor(watermark))
+        for raw in self.api.fetch_pages():
+            if batch.add_raw(raw):
+                break
+        return self._finish_ingest(batch)
+
+    async def fetch_new_async(self, watermark: tuple[datetime, str] | None) -> list[dict]:
+        """fetch_new() on the async arXiv connector."""
+        if self._aapi is None:
+            self._aapi = AsyncArxivAPI()
+        batch = _IngestBatch(self._floor(watermark))
+        async for raw in self._aapi.fetch_pages():
+            if batch.add_raw(raw):
+                break
+        return self._finish_ingest(batch)
+
+    def _finish_ingest(self, batch: "_IngestBatch") -> list[dict]:
+        # advance only when every update since the old watermark was seen;
+        # otherwise the next run pages back over the gap again
+        if batch.error:
+            logger.error(
+                "arXiv: %s after %d good page(s); keeping watermark %s",
+                batch.error, batch.pages, batch.watermark[0].isoformat(),
+            )
+        elif not batch.reached:
+            logger.warning(
+                "arXiv: watermark not reached within ARXIV_MAX_PAGES=%d page(s); keeping watermark %s",
+                Config.ARXIV_MAX_PAGES, batch.watermark[0].isoformat(),
+            )
+        elif batch.newest is not None and batch.newest > batch.watermark:
+            self._pending_watermark = batch.newest
+
+        logger.info("Fetched %d arXiv entries newer than %s", len(batch.papers), batch.watermark[0].isoformat())
+        return sorted(batch.papers.values(), key=_updated)
+
+    def commit_watermark(self):
+        """Advance the stored watermark once this run's papers are processed."""
+        if self._pending_watermark is None:
+            return
+        updated, last_id = self._pending_watermark
+        self.db.set_watermark(WATERMARK_SOURCE, updated, last_id)
+        self._pending_watermark = None
 
-        filtered = []
-        for p in papers:
-            title_lower = p["title"].lower()
-            summary_lower = p["summary"].lower()
-
-            k1 = any(kw in title_lower for kw in all_keywords)
-            k2 = any(kw in summary_lower for kw in all_keywords)
+    def filter_interesting(self, papers: list[dict]) -> list[dict]:
+        all_keywords = set(self.keyword_engine.base_keywords)
+        if Config.ARXIV_LLM_KEYWORDS:
+            # optional refinement: let the model suggest extra keywords
+            all_keywords |= set(self.keyword_engine.generate(papers[-20:]))  # newest
 
-            k3 = any(kw in title_lower for kw in self.keyword_engine.base_keywords)
+        # compiled once per keyword set; one regex pass per field
+        keywords = KeywordMatcher.compile(all_keywords)
+        hints = KeywordMatcher.compile(TITLE_HINTS, prefix=True)
 
-            k4 = "phys" in title_lower or "hep" in title_lower
+        relevance = self.ranker.score(papers)
 
-            if k1 or k2 or k3 or k4:
-                if not self.db.paper_exists(p["id"]):
-                    filtered.append(p)
+        filtered = []
+        for p, rel in zip(papers, relevance):
+            matches = keywords.match(p)
+            title_hints = hints.hits(p["title"])
+            matched = matches["title"] or matches["summary"] or title_hints
+
+            if matched or rel >= Config.ARXIV_MIN_RELEVANCE:
+                p["matches"] = matches
+                p["relevance"] = float(rel)
+                p["score"] = (
+                    2 * len(matches["title"])
+                    + len(matches["summary"])
+                    + 0.5 * bool(title_hints)
+                    + RELEVANCE_WEIGHT * float(rel)
+                )
+                filtered.append(p)
+
+        # one batched lookup for every candidate instead of one per paper
+        archived = self.db.existing_ids([p["id"] for p in filtered])
+        filtered = [p for p in filtered if p["id"] not in archived]
+
+        filtered = self.drop_near_duplicates(filtered)
+
+        # strongest candidates first (stable for ties), then cap
+        filtered.sort(key=lambda p: p["score"], reverse=True)
+        if Config.ARXIV_MAX_PAPERS and len(filtered) > Config.ARXIV_MAX_PAPERS:
+            logger.info(
+                "Capping %d candidates to the top %d", len(filtered), Config.ARXIV_MAX_PAPERS
+            )
+            filtered = filtered[:Config.ARXIV_MAX_PAPERS]
 
         logger.info("Filtered %d interesting new arXiv papers", len(filtered))
         return filtered
 
-    def save(self, paper_id: str, title: str, summary: str):
+    def drop_near_duplicates(self, papers: list[dict]) -> list[dict]:
+        """
+        Skip papers whose title+abstract is a near-duplicate (MinHash
+        Jaccard >= ARXIV_DUPLICATE_THRESHOLD) of an archived paper or of
+        another candidate in this batch: replacements, cross-lists and
+        re-submissions under a new id. Keeps each paper's signature in
+        p["signature"] so save() can index it.
+        """
+        threshold = Config.ARXIV_DUPLICATE_THRESHOLD
+        batch = LSHIndex()
+        kept = []
+        for p in papers:
+            sig = paper_signature(p["title"], p["summary"])
+            dup = self.db.find_near_duplicates(sig, threshold) or batch.query(sig, threshold)
+            if dup:
+                other, sim = dup[0]
+                logger.info("Skipping %s: near-duplicate of %s (similarity %.2f)", p["id"], other, sim)
+                continue
+            p["signature"] = sig
+            batch.add(p["id"], sig)
+            kept.append(p)
+        return kept
+
+    def save(self, paper_id: str, title: str, summary: str, signature=None):
         logger.info("Persisting arXiv paper %s to database", paper_id)
-        self.db.save_paper(paper_id, title, summary)
+        self.db.save_paper(paper_id, title, summary, signature=signature)
+        if self._ranker is not None:
+            self._ranker.add(title, summary)
+
+    def save_many(self, papers: list[dict], summaries: list[str]) -> tuple[int, int]:
+        """Archive papers with their summaries in one transaction; (inserted, skipped)."""
+        rows = [
+            {"id": p["id"], "title": p["title"], "summary": s, "signature": p.get("signature")}
+            for p, s in zip(papers, summaries)
+        ]
+        inserted, skipped = self.db.save_papers(rows)
+        if self._ranker is not None:
+            for r in rows:
+                self._ranker.add(r["title"], r["summary"])
+        return inserted, skipped
 
     def format_paper(self, p: dict, summary: str) -> str:
         return f"**{p['title']}**\n{summary}\n{p['link']}"
 
-    def run(self) -> list[dict]:
-        raw = self.fetch_raw()
-
-        papers = self.parse(raw, days=1)
+    def _select_window(self, papers: list[dict], watermark) -> list[dict]:
+        if watermark is None:
+            # first run: no watermark yet, keep the recent-window behaviour
+            recent = self.within(papers, days=1)
+            if len(recent) == 0:
+                logger.info("No papers in last 1 day, falling back to last %d days", Config.ARXIV_LOOKBACK_DAYS)
+            else:
+                papers = recent
+        return papers
 
-        if len(papers) == 0:
-            logger.info("No papers in last 1 day, falling back to last 3 days")
-            papers = self.parse(raw, days=3)
+    def run(self) -> list[dict]:
+        watermark = self.db.get_watermark(WATERMARK_SOURCE)
+        papers = self._select_window(self.fetch_new(watermark), watermark)
 
         interesting = self.filter_interesting(papers)
         return interesting
-        
+
+    async def run_async(self) -> list[dict]:
+        watermark = self.db.get_watermark(WATERMARK_SOURCE)
+        papers = self._select_window(await self.fetch_new_async(watermark), watermark)
+        # filtering touches the SQLite archive, so it stays on the loop thread
+        return self.filter_interesting(papers)
+
     def format_html(self, p: dict, summary: str) -> str:
         return f"<b>{p['title']}</b><br>{summary}<br><a href='{p['link']}'>[link]</a><br><br>"
 
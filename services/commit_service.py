@@ -1,6 +1,6 @@
 import logging
 
-from flowc.connectors.github import GitConnector
+from flowc.connectors.github import AsyncGitConnector, GitConnector
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +8,7 @@ logger = logging.getLogger(__name__)
 class CommitService:
     def __init__(self):
         self.git = GitConnector()
+        self.agit = AsyncGitConnector(self.git.repo_path)
 
     def get_raw(self, days=1):
         logger.info("Pulling latest commits for last %s day(s)", days)
@@ -20,6 +21,17 @@ class CommitService:
         logger.info("Retrieved %d characters of commit log", len(commits))
         return commits
 
+    async def get_raw_async(self, days=1):
+        logger.info("Pulling latest commits for last %s day(s)", days)
+        try:
+            await self.agit.pull()
+        except Exception as e:  # noqa: BLE001
+            logger.warning("git pull failed: %s", e)
+
+        commits = await self.agit.get_commit_log(days=days)
+        logger.info("Retrieved %d characters of commit log", len(commits))
+        return commits
+
     def run(self, days=1) -> str:
         raw = self.get_raw(days)
         return self.summarize(raw)
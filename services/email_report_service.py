@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from flowc.connectors.email_sender import EmailSender
+from flowc.connectors.email_sender import AsyncEmailSender, EmailSender
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -9,6 +9,7 @@ logger = logging.getLogger(__name__)
 class EmailReportService:
     def __init__(self):
         self.sender = EmailSender()
+        self.asender = AsyncEmailSender()
         self.template_path = (
             Path(__file__).resolve().parents[1] / "templates" / "email_report.html"
         )
@@ -29,3 +30,11 @@ class EmailReportService:
     ):
         logger.info("Sending email report with subject '%s'", subject)
         self.sender.send(html, subject=subject)
+
+    async def send_async(
+        self,
+        html: str,
+        subject: str = f"[FlowC] Evening Report - {datetime.now().strftime('%Y-%m-%d')}",
+    ):
+        logger.info("Sending email report with subject '%s'", subject)
+        await self.asender.send(html, subject=subject)
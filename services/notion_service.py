@@ -1,6 +1,7 @@
+import asyncio
 import logging
 from datetime import datetime, date, timedelta
-from flowc.connectors.notion import NotionClient
+from flowc.connectors.notion import AsyncNotionClient, NotionClient
 from flowc.config import Config
 from flowc.utils.markdown_to_rich_text import markdown_to_rich_text
 
@@ -13,6 +14,14 @@ class NotionService:
     def __init__(self):
         self.client = NotionClient()
         self.db_id = Config.NOTION_DAILY_DB
+        self._aclient = None
+
+    @property
+    def aclient(self) -> AsyncNotionClient:
+        """Async client for the asyncio runner, created on first use."""
+        if self._aclient is None:
+            self._aclient = AsyncNotionClient()
+        return self._aclient
     
     def get_today_page(self, db_id: str):
         today = datetime.now().strftime("%Y-%m-%d")
@@ -22,20 +31,20 @@ class NotionService:
     def read_field(self, page, name: str) -> str:
         return NotionClient.get_text(page["properties"], name)
 
-    def write_field(self, page_id: str, field: str, text: str, markdown: bool = True):
+    @staticmethod
+    def _field_props(field: str, text: str, markdown: bool) -> dict:
         if markdown:
             rich = markdown_to_rich_text(text)
         else:
             rich = [{"text": {"content": text}}]
-
-        return self.client.update_page(
-            page_id,
-            {
-                field: {
-                    "rich_text": rich,
-                }
+        return {
+            field: {
+                "rich_text": rich,
             }
-        )
+        }
+
+    def write_field(self, page_id: str, field: str, text: str, markdown: bool = True):
+        return self.client.update_page(page_id, self._field_props(field, text, markdown))
 
     def read_todo(self, page) -> str:
         return self.read_field(page, "TODO")
@@ -55,6 +64,18 @@ class NotionService:
     def write_tomorrow(self, page_id: str, plan: str):
         return self.write_field(page_id, "Tomorrow", plan)
 
+    @staticmethod
+    def _carry_over_props(today: str, carry_text: str) -> dict:
+        return {
+            "Name": {"title": [{"text": {"content": f"Daily Log — {today}"}}]},
+            "Date": {"date": {"start": today}},
+            "TODO": {"rich_text": [{"text": {"content": carry_text}}]},
+            "Summary": {"rich_text": []},
+            "GitSummary": {"rich_text": []},
+            "AISummary": {"rich_text": []},
+            "Tomorrow": {"rich_text": []}
+        }
+
     def carry_over(self):
         """Yesterday.Tomorrow -> Today's TODO."""
         today = date.today().isoformat()
@@ -85,14 +106,57 @@ class NotionService:
             logger.info("Updated today's TODO with carried-over items")
             return
 
-        props = {
-            "Name": {"title": [{"text": {"content": f"Daily Log — {today}"}}]},
-            "Date": {"date": {"start": today}},
-            "TODO": {"rich_text": [{"text": {"content": carry_text}}]},
-            "Summary": {"rich_text": []},
-            "GitSummary": {"rich_text": []},
-            "AISummary": {"rich_text": []},
-            "Tomorrow": {"rich_text": []}
-        }
+        props = self._carry_over_props(today, carry_text)
         new_page = self.client.create_page(self.db_id, props)
-        logger.info("Created new Notion page for today with carried TODO items")
\ No newline at end of file
+        logger.info("Created new Notion page for today with carried TODO items")
+
+    # ----------------------------------------------------------
+    # asyncio variants (same behaviour, used by flows.runner)
+    # ----------------------------------------------------------
+    async def get_today_page_async(self, db_id: str):
+        today = datetime.now().strftime("%Y-%m-%d")
+        logger.info("Querying Notion for page with date %s", today)
+        return await self.aclient.query_by_date(db_id, today)
+
+    async def write_field_async(self, page_id: str, field: str, text: str, markdown: bool = True):
+        return await self.aclient.update_page(page_id, self._field_props(field, text, markdown))
+
+    async def write_ai_summary_async(self, page_id: str, summary: str):
+        return await self.write_field_async(page_id, "AISummary", summary)
+
+    async def write_git_summary_async(self, page_id: str, summary: str):
+        return await self.write_field_async(page_id, "GitSummary", summary)
+
+    async def carry_over_async(self):
+        """carry_over() with yesterday's and today's page queried concurrently."""
+        today = date.today().isoformat()
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+
+        y_page, t_page = await asyncio.gather(
+            self.aclient.query_by_date(self.db_id, yesterday),
+            self.aclient.query_by_date(self.db_id, today),
+        )
+        if not y_page:
+            logger.warning("No Notion page found for yesterday; skipping carry-over")
+            return
+
+        carry_text = self.aclient.get_text(y_page["properties"], "Tomorrow")
+        if not carry_text:
+            logger.info("No 'Tomorrow' items to carry over from yesterday")
+            return
+
+        if t_page:
+            logger.info("Updating today's TODO from yesterday's 'Tomorrow' field")
+            await self.aclient.update_page(
+                t_page["id"],
+                {
+                    "TODO": {
+                        "rich_text": [{"text": {"content": carry_text}}]
+                    }
+                }
+            )
+            logger.info("Updated today's TODO with carried-over items")
+            return
+
+        await self.aclient.create_page(self.db_id, self._carry_over_props(today, carry_text))
+        logger.info("Created new Notion page for today with carried TODO items")
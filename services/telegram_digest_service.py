@@ -1,6 +1,6 @@
 import logging
 
-from flowc.connectors.telegram import TelegramClient
+from flowc.connectors.telegram import AsyncTelegramClient, TelegramClient
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +8,7 @@ logger = logging.getLogger(__name__)
 class TelegramDigestService:
     def __init__(self):
         self.client = TelegramClient()
+        self._aclient = None
 
     def format_morning(self) -> str:
         return "*Morning Plan*\n\n"
@@ -19,6 +20,12 @@ class TelegramDigestService:
         logger.info("Sending Telegram message (%d chars)", len(text))
         self.client.send(text)
 
+    async def send_async(self, text: str):
+        if self._aclient is None:
+            self._aclient = AsyncTelegramClient()
+        logger.info("Sending Telegram message (%d chars)", len(text))
+        await self._aclient.send(text)
+
     def build_message_for_evening(self, commit, summary, arxiv):
         msg = self.format_evening()
         msg += "*Commit*\n"
@@ -0,0 +1,57 @@
+import hashlib
+import math
+from collections.abc import Iterable
+
+import numpy as np
+
+
+class BloomFilter:
+    """
+    Set membership with no false negatives and a bounded false-positive
+    rate: `key in bloom` is False only if the key was never added.
+
+    Sized for `capacity` keys at `error_rate`; past capacity the
+    false-positive rate climbs (see `saturated`) and the owner should
+    rebuild a larger filter.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        # optimal bit count and hash count for n keys at rate p
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, key: str) -> np.ndarray:
+        # double hashing: h1 + i * h2 from one 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.size for i in range(self.hashes)], dtype=np.int64)
+
+    def add(self, key: str):
+        pos = self._positions(key)
+        # .at: several positions may share a byte
+        np.bitwise_or.at(self._bits, pos >> 3, (1 << (pos & 7)).astype(np.uint8))
+        self.count += 1
+
+    def update(self, keys: Iterable[str]):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        pos = self._positions(key)
+        return bool(np.all(self._bits[pos >> 3] & (1 << (pos & 7))))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
+
+    @property
+    def nbytes(self) -> int:
+        return self._bits.nbytes
@@ -0,0 +1,64 @@
+import re
+from functools import lru_cache
+
+_SEP_RE = re.compile(r"[\s\-]+")
+
+
+def _normalize(text: str) -> str:
+    return _SEP_RE.sub(" ", text.strip().lower())
+
+
+class KeywordMatcher:
+    """
+    Matches a fixed keyword set with a single compiled alternation regex,
+    so each text is scanned once regardless of how many keywords there are.
+
+    - whole-word mode (default): "tau" matches "tau"/"taus" but not
+      "restaurant"; spaces in a keyword also match hyphens
+      ("belle ii" ~ "Belle-II").
+    - prefix mode: a keyword matches at the start of a word
+      ("phys" ~ "physics").
+    """
+
+    def __init__(self, keywords, *, prefix: bool = False):
+        self.keywords = frozenset(_normalize(k) for k in keywords if k and k.strip())
+        self.prefix = prefix
+
+        if not self.keywords:
+            self._re = None
+            return
+
+        # longest first so "belle ii" wins over "belle"
+        alts = "|".join(
+            r"[\s\-]+".join(re.escape(part) for part in kw.split(" "))
+            for kw in sorted(self.keywords, key=len, reverse=True)
+        )
+        tail = "" if prefix else r"(?:e?s)?(?!\w)"
+        self._re = re.compile(rf"(?<!\w)({alts}){tail}", re.IGNORECASE)
+
+    @classmethod
+    def compile(cls, keywords, *, prefix: bool = False) -> "KeywordMatcher":
+        """Cached constructor: one compiled matcher per keyword set."""
+        return _compiled(frozenset(_normalize(k) for k in keywords if k and k.strip()), prefix)
+
+    def find(self, text: str) -> list[tuple[str, int]]:
+        """All (keyword, offset) hits in `text`, in order of appearance."""
+        if self._re is None or not text:
+            return []
+        return [(_normalize(m.group(1)), m.start()) for m in self._re.finditer(text)]
+
+    def hits(self, text: str) -> list[str]:
+        """Distinct keywords found in `text`, in order of first appearance."""
+        return list(dict.fromkeys(kw for kw, _ in self.find(text)))
+
+    def match(self, paper: dict) -> dict[str, list[str]]:
+        """Keyword hits per field: {"title": [...], "summary": [...]}."""
+        return {
+            "title": self.hits(paper.get("title", "")),
+            "summary": self.hits(paper.get("summary", "")),
+        }
+
+
+@lru_cache(maxsize=32)
+def _compiled(keywords: frozenset, prefix: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, prefix=prefix)
@@ -0,0 +1,85 @@
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16                  # 16 bands x 8 rows: candidates from ~0.7 Jaccard up
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3                 # word 3-grams
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240101)  # fixed: signatures are persisted
+_A = _rng.randint(1, _PRIME, size=NUM_PERM, dtype=np.int64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM, dtype=np.int64)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str) -> set[int]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE:
+        return {zlib.crc32(" ".join(words).encode()) & _PRIME} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE]).encode()) & _PRIME
+        for i in range(len(words) - SHINGLE + 1)
+    }
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32 values) of a text's word shingles."""
+    sh = shingles(text)
+    if not sh:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint32)
+    x = np.fromiter(sh, dtype=np.int64, count=len(sh))
+    # (a * x + b) mod p for every permutation/shingle pair, min per permutation
+    hashed = (np.outer(_A, x) + _B[:, None]) % _PRIME
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def paper_signature(title: str, abstract: str) -> np.ndarray:
+    return signature(f"{title} {abstract}")
+
+
+def band_hashes(sig: np.ndarray) -> list[int]:
+    """One signed 64-bit bucket id per LSH band (fits an SQLite INTEGER)."""
+    out = []
+    for band in range(BANDS):
+        chunk = sig[band * ROWS:(band + 1) * ROWS].astype("<u4").tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        out.append(int.from_bytes(digest, "little", signed=True))
+    return out
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.mean(a == b))
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<u4").astype(np.uint32)
+
+
+class LSHIndex:
+    """In-memory LSH buckets, for near-duplicates within one batch."""
+
+    def __init__(self):
+        self._buckets: dict[tuple[int, int], list[str]] = {}
+        self._sigs: dict[str, np.ndarray] = {}
+
+    def add(self, key: str, sig: np.ndarray):
+        self._sigs[key] = sig
+        for band, h in enumerate(band_hashes(sig)):
+            self._buckets.setdefault((band, h), []).append(key)
+
+    def query(self, sig: np.ndarray, threshold: float) -> list[tuple[str, float]]:
+        candidates = set()
+        for band, h in enumerate(band_hashes(sig)):
+            candidates.update(self._buckets.get((band, h), ()))
+        hits = [(k, similarity(sig, self._sigs[k])) for k in candidates]
+        return sorted((h for h in hits if h[1] >= threshold), key=lambda h: -h[1])